@@ -1,53 +1,243 @@
 #!/usr/bin/env python3
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import json
 from PIL import Image, ExifTags
-from PIL.ExifTags import TAGS
 import io
 import base64
 from typing import Dict, List, Optional, Tuple
 import imagehash
+import numpy as np
+import scipy.fft
 from datetime import datetime
+from pathlib import Path
 import os
+import tempfile
 
-class AdvancedImageAnalyzer:
+# EXIF fields consumed by the metadata report, by tag id
+_IFD0_TAGS = {305: 'Software', 271: 'Make', 272: 'Model', 34853: 'GPSInfo'}
+_EXIF_IFD = 0x8769
+_EXIF_IFD_TAGS = {36867: 'DateTimeOriginal'}
+
+# Squared distance of each gray level from mid-gray, for the lighting heuristic
+_LIGHTING_WEIGHTS = (np.arange(256, dtype=np.int64) - 128) ** 2
+
+# Downloads larger than this are abandoned instead of buffered
+MAX_IMAGE_BYTES = 25_000_000
+
+# Bump whenever the analysis output changes; stored analyses of other versions are ignored
+ANALYSIS_CACHE_VERSION = 1
+
+# Largest average-hash Hamming distance still reported as "similar" (similarity > 85)
+_SIMILAR_MAX_DISTANCE = 14
+
+
+def _hamming(hash1: int, hash2: int) -> int:
+    """Hamming distance between two integer hashes"""
+    return bin(hash1 ^ hash2).count('1')
+
+
+class _BKTree:
+    """Burkhard-Keller tree of integer hashes for radius queries under Hamming distance"""
+    
     def __init__(self):
+        self.root = None
+    
+    def add(self, value: int):
+        if self.root is None:
+            self.root = (value, {})
+            return
+        node = self.root
+        while True:
+            distance = _hamming(value, node[0])
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (value, {})
+                return
+            node = child
+    
+    def find(self, value: int, radius: int) -> List[Tuple[int, int]]:
+        """Return (distance, value) for every stored value within radius"""
+        matches = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node_value, children = stack.pop()
+            distance = _hamming(value, node_value)
+            if distance <= radius:
+                matches.append((distance, node_value))
+            # Triangle inequality: only subtrees in [d - r, d + r] can match
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return matches
+
+
+class AdvancedImageAnalyzer:
+    def __init__(self, cache_dir: Optional[str] = None, max_retries: int = 0):
         self.reverse_search_engines = [
             "https://www.google.com/searchbyimage?image_url=",
             "https://yandex.com/images/search?rpt=imageview&url=",
             "https://tineye.com/search?url="
         ]
+        self.max_workers = 16
+        # Average hashes keyed by SHA256 of the image bytes
+        self._hash_cache: Dict[str, int] = {}
+        # On-disk analyses keyed by the same content hash (off unless a directory is given)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        
+        # Shared session so batch downloads reuse pooled keep-alive connections;
+        # failed requests are not retried unless max_retries is set
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=max_retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
-    def analyze_profile_image(self, image_url: str, username: str) -> Dict:
+    def _fetch_image(self, image_url: str) -> Optional[bytes]:
+        """Download image bytes, returning None on failure"""
+        try:
+            with self.session.get(image_url, timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    return None
+                # Reject oversized and non-image responses before reading the body
+                if int(response.headers.get('Content-Length') or 0) > MAX_IMAGE_BYTES:
+                    return None
+                if not response.headers.get('Content-Type', '').startswith('image/'):
+                    return None
+                image_data = bytearray()
+                for chunk in response.iter_content(65536):
+                    image_data.extend(chunk)
+                    if len(image_data) > MAX_IMAGE_BYTES:
+                        return None
+                return bytes(image_data)
+        except Exception:
+            return None
+    
+    def _fetch_images(self, image_urls: List[str]) -> Dict[str, Optional[bytes]]:
+        """Download several images concurrently, once per distinct URL"""
+        unique_urls = list(dict.fromkeys(image_urls))
+        if not unique_urls:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(self._fetch_image, unique_urls)))
+    
+    def analyze_profile_image(self, image_url: str, username: str,
+                              image_data: Optional[bytes] = None) -> Dict:
         """Comprehensive profile image analysis"""
         try:
-            response = requests.get(image_url, timeout=10)
-            if response.status_code != 200:
+            if image_data is None:
+                image_data = self._fetch_image(image_url)
+            if image_data is None:
                 return {"error": "Failed to download image"}
             
-            image_data = response.content
+            content_key = self._content_key(image_data)
+            cached = self._load_cached_analysis(content_key, image_url)
+            if cached is not None:
+                return cached
+            
             image = Image.open(io.BytesIO(image_data))
+            # Pixel statistics and hashes run on a downsampled copy
+            thumb = self._thumbnail(image)
+            return self._analyze_decoded_image(image_url, image_data, content_key, image, thumb,
+                                               self._generate_hashes(thumb))
+            
+        except Exception as e:
+            return {"error": f"Image analysis failed: {str(e)}"}
+    
+    def _analyze_decoded_image(self, image_url: str, image_data: bytes, content_key: str,
+                               image: Image.Image, thumb: Image.Image, hash_analysis: Dict) -> Dict:
+        """Assemble the analysis of an already decoded image"""
+        try:
+            if "hash_values" in hash_analysis:
+                self._hash_cache[content_key] = hash_analysis["hash_values"]["average_hash"]
             
             analysis = {
-                "basic_info": self._get_basic_info(image, image_data),
+                "basic_info": self._get_basic_info(image, image_data, thumb),
                 "metadata": self._extract_metadata(image),
-                "hash_analysis": self._generate_hashes(image),
+                "hash_analysis": hash_analysis,
                 "reverse_search_urls": self._get_reverse_search_urls(image_url),
-                "similarity_check": self._check_common_patterns(image),
+                "similarity_check": self._check_common_patterns(image, thumb),
                 "authenticity_score": 0
             }
             
             # Calculate authenticity score
             analysis["authenticity_score"] = self._calculate_authenticity_score(analysis)
             
+            self._store_analysis(content_key, analysis)
             return analysis
             
         except Exception as e:
             return {"error": f"Image analysis failed: {str(e)}"}
     
-    def _get_basic_info(self, image: Image.Image, image_data: bytes) -> Dict:
+    def _content_key(self, image_data: bytes) -> str:
+        """Content hash identifying an image independently of its URL"""
+        return hashlib.sha256(image_data).hexdigest()
+    
+    def _load_cached_analysis(self, content_key: str, image_url: str) -> Optional[Dict]:
+        """Load a stored analysis of identical image content, if any"""
+        if self.cache_dir is None:
+            return None
+        
+        cache_file = self.cache_dir / f"{content_key}.json"
+        if not cache_file.exists():
+            return None
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        
+        # Entries written by another version of the analysis are stale
+        if not isinstance(entry, dict) or entry.get("version") != ANALYSIS_CACHE_VERSION:
+            return None
+        analysis = entry.get("analysis")
+        if not isinstance(analysis, dict):
+            return None
+        
+        # The same content may have been stored under a different URL
+        analysis["reverse_search_urls"] = self._get_reverse_search_urls(image_url)
+        average_hash = analysis.get("hash_analysis", {}).get("hash_values", {}).get("average_hash")
+        if average_hash is not None:
+            self._hash_cache[content_key] = average_hash
+        return analysis
+    
+    def _store_analysis(self, content_key: str, analysis: Dict):
+        """Persist an analysis under its content hash"""
+        if self.cache_dir is None:
+            return
+        
+        try:
+            payload = json.dumps({"version": ANALYSIS_CACHE_VERSION, "analysis": analysis}, ensure_ascii=False)
+        except (TypeError, ValueError):
+            # Not representable as JSON; storing a lossy copy would change later results
+            return
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write beside the target and rename, so readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(temp_path, self.cache_dir / f"{content_key}.json")
+            except OSError:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            pass
+    
+    def _thumbnail(self, image: Image.Image, max_side: int = 256) -> Image.Image:
+        """Box-downsample by an integer factor so the short side stays near max_side"""
+        factor = max(1, min(image.size) // max_side)
+        if factor == 1:
+            return image
+        return image.resize((image.size[0] // factor, image.size[1] // factor), Image.BOX)
+    
+    def _get_basic_info(self, image: Image.Image, image_data: bytes, thumb: Image.Image) -> Dict:
         """Extract basic image information"""
         return {
             "format": image.format,
@@ -56,28 +246,34 @@ class AdvancedImageAnalyzer:
             "file_size": len(image_data),
             "aspect_ratio": round(image.size[0] / image.size[1], 2) if image.size[1] > 0 else 0,
             "is_square": image.size[0] == image.size[1],
-            "color_analysis": self._analyze_colors(image)
+            "color_analysis": self._analyze_colors(thumb)
         }
     
     def _extract_metadata(self, image: Image.Image) -> Dict:
         """Extract EXIF and other metadata"""
         metadata = {}
+        has_metadata = False
         
         try:
             exifdata = image.getexif()
             if exifdata:
-                for tag_id in exifdata:
-                    tag = TAGS.get(tag_id, tag_id)
-                    data = exifdata.get(tag_id)
-                    if isinstance(data, bytes):
-                        data = data.decode('utf-8', errors='ignore')
-                    metadata[tag] = str(data)
+                has_metadata = True
+                # Look up only the fields we report, skipping blobs like MakerNote
+                wanted = [(exifdata, _IFD0_TAGS), (exifdata.get_ifd(_EXIF_IFD), _EXIF_IFD_TAGS)]
+                for ifd, tags in wanted:
+                    for tag_id, tag in tags.items():
+                        data = ifd.get(tag_id)
+                        if data is None:
+                            continue
+                        if isinstance(data, bytes):
+                            data = data.decode('utf-8', errors='ignore')
+                        metadata[tag] = str(data)
         except:
             pass
         
         return {
             "exif_data": metadata,
-            "has_metadata": len(metadata) > 0,
+            "has_metadata": has_metadata,
             "creation_software": metadata.get('Software', 'Unknown'),
             "camera_info": {
                 "make": metadata.get('Make', 'Unknown'),
@@ -86,23 +282,46 @@ class AdvancedImageAnalyzer:
             "gps_info": self._extract_gps_info(metadata)
         }
     
-    def _generate_hashes(self, image: Image.Image) -> Dict:
+    def _generate_hashes(self, image: Image.Image,
+                         perceptual_hash: Optional[imagehash.ImageHash] = None) -> Dict:
         """Generate various image hashes for comparison"""
         try:
-            return {
-                "average_hash": str(imagehash.average_hash(image)),
-                "perceptual_hash": str(imagehash.phash(image)),
-                "difference_hash": str(imagehash.dhash(image)),
-                "wavelet_hash": str(imagehash.whash(image))
+            hashes = {
+                "average_hash": imagehash.average_hash(image),
+                "perceptual_hash": perceptual_hash or imagehash.phash(image),
+                "difference_hash": imagehash.dhash(image),
+                "wavelet_hash": imagehash.whash(image)
             }
+            # Hex strings for reports, 64-bit integers for XOR/popcount comparison
+            hash_analysis = {name: str(value) for name, value in hashes.items()}
+            hash_analysis["hash_values"] = {name: self._hash_u64(value) for name, value in hashes.items()}
+            return hash_analysis
         except:
             return {}
     
+    def _hash_u64(self, image_hash: imagehash.ImageHash) -> int:
+        """Pack an 8x8 ImageHash into a 64-bit integer"""
+        return int.from_bytes(np.packbits(image_hash.hash.ravel()).tobytes(), 'big')
+    
+    def _batch_perceptual_hashes(self, images: List[Image.Image]) -> List[imagehash.ImageHash]:
+        """Perceptual hashes for many images with a single batched DCT"""
+        if not images:
+            return []
+        
+        # Same pipeline as imagehash.phash, stacked along a leading batch axis
+        pixels = np.stack([
+            np.asarray(img.convert('L').resize((32, 32), Image.LANCZOS), dtype=np.float64)
+            for img in images
+        ])
+        lowfreq = scipy.fft.dctn(pixels, axes=(1, 2))[:, :8, :8].reshape(len(images), -1)
+        bits = lowfreq > np.median(lowfreq, axis=1, keepdims=True)
+        return [imagehash.ImageHash(row.reshape(8, 8)) for row in bits]
+    
     def _get_reverse_search_urls(self, image_url: str) -> List[str]:
         """Generate reverse image search URLs"""
         return [engine + image_url for engine in self.reverse_search_engines]
     
-    def _check_common_patterns(self, image: Image.Image) -> Dict:
+    def _check_common_patterns(self, image: Image.Image, thumb: Image.Image) -> Dict:
         """Check for common fake profile patterns"""
         analysis = {
             "is_stock_photo_likely": False,
@@ -118,12 +337,12 @@ class AdvancedImageAnalyzer:
         if width >= 1000 and height >= 1000:
             analysis["quality_indicators"]["high_resolution"] = True
         
-        if image.mode == 'RGB' and self._has_professional_lighting(image):
+        if image.mode == 'RGB' and self._has_professional_lighting(thumb):
             analysis["is_stock_photo_likely"] = True
             analysis["red_flags"].append("Professional studio lighting detected")
         
         # AI generation indicators
-        if self._check_ai_artifacts(image):
+        if self._check_ai_artifacts(thumb):
             analysis["is_ai_generated_likely"] = True
             analysis["red_flags"].append("Possible AI generation artifacts")
         
@@ -132,11 +351,17 @@ class AdvancedImageAnalyzer:
     def _analyze_colors(self, image: Image.Image) -> Dict:
         """Analyze color distribution"""
         try:
-            colors = image.getcolors(maxcolors=256*256*256)
-            if colors:
-                dominant_color = max(colors, key=lambda x: x[0])
+            pixels = np.asarray(image)
+            if pixels.size:
+                # Count distinct pixel values (whole band tuples for multi-band images)
+                if pixels.ndim == 3:
+                    colors, counts = np.unique(pixels.reshape(-1, pixels.shape[2]), axis=0, return_counts=True)
+                    dominant_color = tuple(colors[counts.argmax()].tolist())
+                else:
+                    colors, counts = np.unique(pixels, return_counts=True)
+                    dominant_color = colors[counts.argmax()].item()
                 return {
-                    "dominant_color": dominant_color[1] if len(dominant_color) > 1 else "Unknown",
+                    "dominant_color": dominant_color,
                     "color_count": len(colors),
                     "is_grayscale": image.mode in ['L', 'LA']
                 }
@@ -157,9 +382,9 @@ class AdvancedImageAnalyzer:
         # Simple heuristic - check for even lighting distribution
         try:
             grayscale = image.convert('L')
-            histogram = grayscale.histogram()
+            histogram = np.asarray(grayscale.histogram(), dtype=np.int64)
             # Professional photos often have more even distribution
-            variance = sum((i - 128) ** 2 * histogram[i] for i in range(256)) / sum(histogram)
+            variance = int(histogram @ _LIGHTING_WEIGHTS) / int(histogram.sum())
             return variance < 3000  # Threshold for even lighting
         except:
             return False
@@ -201,49 +426,124 @@ class AdvancedImageAnalyzer:
     
     def compare_images(self, image1_url: str, image2_url: str) -> Dict:
         """Compare two images for similarity"""
+        downloads = self._fetch_images([image1_url, image2_url])
+        return self._compare_image_data(downloads.get(image1_url), downloads.get(image2_url))
+    
+    def _compare_image_data(self, image1_data: Optional[bytes], image2_data: Optional[bytes]) -> Dict:
+        """Compare two already downloaded images for similarity"""
         try:
-            # Download both images
-            img1_response = requests.get(image1_url, timeout=10)
-            img2_response = requests.get(image2_url, timeout=10)
-            
-            if img1_response.status_code != 200 or img2_response.status_code != 200:
+            if image1_data is None or image2_data is None:
                 return {"error": "Failed to download images"}
             
-            img1 = Image.open(io.BytesIO(img1_response.content))
-            img2 = Image.open(io.BytesIO(img2_response.content))
-            
-            # Generate hashes
-            hash1 = imagehash.average_hash(img1)
-            hash2 = imagehash.average_hash(img2)
-            
-            # Calculate similarity
-            similarity = 100 - (hash1 - hash2)
-            
-            return {
-                "similarity_percentage": max(0, similarity),
-                "are_similar": similarity > 85,
-                "hash_difference": hash1 - hash2,
-                "comparison_method": "Average Hash"
-            }
+            # Hamming distance between the 64-bit average hashes
+            hash_difference = _hamming(self._average_hash(image1_data), self._average_hash(image2_data))
+            return self._hash_similarity(hash_difference)
             
         except Exception as e:
             return {"error": f"Image comparison failed: {str(e)}"}
     
-    def batch_analyze_images(self, image_urls: List[str], usernames: List[str]) -> Dict:
-        """Analyze multiple images in batch"""
+    def _hash_similarity(self, hash_difference: int) -> Dict:
+        """Build a comparison result from a hash Hamming distance"""
+        # Calculate similarity
+        similarity = 100 - hash_difference
+        
+        return {
+            "similarity_percentage": max(0, similarity),
+            "are_similar": similarity > 85,
+            "hash_difference": hash_difference,
+            "comparison_method": "Average Hash"
+        }
+    
+    def _average_hash(self, image_data: bytes, content_key: Optional[str] = None) -> int:
+        """Average hash as an integer, computed once per distinct image"""
+        key = content_key or self._content_key(image_data)
+        if key not in self._hash_cache:
+            image = Image.open(io.BytesIO(image_data))
+            self._hash_cache[key] = self._hash_u64(imagehash.average_hash(self._thumbnail(image)))
+        return self._hash_cache[key]
+    
+    def _hamming_matrix(self, hashes: List[int]) -> np.ndarray:
+        """Pairwise Hamming distances between 64-bit hashes"""
+        packed = np.array(hashes, dtype=np.uint64)
+        xor = packed[:, None] ^ packed[None, :]
+        bits = np.unpackbits(xor.view(np.uint8).reshape(len(hashes), len(hashes), 8), axis=2)
+        return bits.sum(axis=2, dtype=np.int64)
+    
+    def batch_analyze_images(self, image_urls: List[str], usernames: List[str],
+                             include_all_comparisons: bool = True) -> Dict:
+        """Analyze multiple images in batch
+        
+        With include_all_comparisons=False only similar pairs are reported,
+        found through a BK-tree instead of comparing every pair.
+        """
         results = {}
         
-        for i, (url, username) in enumerate(zip(image_urls, usernames)):
-            print(f"Analyzing image {i+1}/{len(image_urls)}: {username}")
-            results[username] = self.analyze_profile_image(url, username)
+        # Download every image up front so the analysis and comparison
+        # passes below never wait on the network
+        downloads = self._fetch_images(image_urls)
         
-        # Cross-compare all images
-        comparisons = {}
-        for i in range(len(image_urls)):
-            for j in range(i+1, len(image_urls)):
-                user1, user2 = usernames[i], usernames[j]
-                comparison_key = f"{user1}_vs_{user2}"
-                comparisons[comparison_key] = self.compare_images(image_urls[i], image_urls[j])
+        # Group downloads by content so identical pictures are analyzed once
+        content_keys = {url: self._content_key(data) for url, data in downloads.items() if data is not None}
+        unique_content = {}
+        for url, key in content_keys.items():
+            unique_content.setdefault(key, url)
+        first_user = {}
+        for url, username in zip(image_urls, usernames):
+            first_user.setdefault(url, username)
+        
+        # Decode each distinct image once and compute all perceptual hashes as one batch
+        analyses = {}
+        decoded = {}
+        decode_errors = {}
+        for i, (key, url) in enumerate(unique_content.items()):
+            print(f"Analyzing image {i+1}/{len(unique_content)}: {first_user.get(url, url)}")
+            cached_analysis = self._load_cached_analysis(key, url)
+            if cached_analysis is not None:
+                analyses[key] = cached_analysis
+                continue
+            try:
+                image = Image.open(io.BytesIO(downloads[url]))
+                decoded[key] = (image, self._thumbnail(image))
+            except Exception as e:
+                decode_errors[key] = f"Image analysis failed: {str(e)}"
+        
+        try:
+            perceptual_hashes = dict(zip(decoded, self._batch_perceptual_hashes([t for _, t in decoded.values()])))
+        except Exception:
+            perceptual_hashes = {}
+        
+        for key, (image, thumb) in decoded.items():
+            url = unique_content[key]
+            hash_analysis = self._generate_hashes(thumb, perceptual_hashes.get(key))
+            analyses[key] = self._analyze_decoded_image(url, downloads[url], key, image, thumb, hash_analysis)
+        
+        # Broadcast each analysis to every username showing that content
+        for url, username in zip(image_urls, usernames):
+            key = content_keys.get(url)
+            if key is None:
+                results[username] = {"error": "Failed to download image"}
+            elif key in decode_errors:
+                results[username] = {"error": decode_errors[key]}
+            else:
+                analysis = analyses[key]
+                if url != unique_content[key] and "error" not in analysis:
+                    analysis = dict(analysis, reverse_search_urls=self._get_reverse_search_urls(url))
+                results[username] = analysis
+        
+        # Hash each distinct image once
+        hashes = {}
+        for key, url in unique_content.items():
+            if key in decode_errors:
+                continue
+            try:
+                hashes[key] = self._average_hash(downloads[url], key)
+            except Exception:
+                pass
+        
+        if include_all_comparisons:
+            comparisons = self._all_pair_comparisons(image_urls, usernames, downloads, content_keys, hashes)
+        else:
+            comparisons = self._similar_pair_comparisons(image_urls, usernames, content_keys, hashes)
         
         return {
             "individual_analysis": results,
@@ -251,6 +551,67 @@ class AdvancedImageAnalyzer:
             "summary": self._generate_batch_summary(results, comparisons)
         }
     
+    def _all_pair_comparisons(self, image_urls: List[str], usernames: List[str], downloads: Dict,
+                              content_keys: Dict[str, str], hashes: Dict[str, int]) -> Dict:
+        """Compare every pair of images using one vectorized distance matrix"""
+        hashed_keys = list(hashes)
+        hash_index = {key: k for k, key in enumerate(hashed_keys)}
+        distances = self._hamming_matrix([hashes[key] for key in hashed_keys])
+        
+        comparisons = {}
+        for i in range(len(image_urls)):
+            for j in range(i+1, len(image_urls)):
+                user1, user2 = usernames[i], usernames[j]
+                url1, url2 = image_urls[i], image_urls[j]
+                key1, key2 = content_keys.get(url1), content_keys.get(url2)
+                comparison_key = f"{user1}_vs_{user2}"
+                if key1 is not None and key1 == key2:
+                    # Byte-identical content needs no hash math
+                    comparisons[comparison_key] = self._hash_similarity(0)
+                elif key1 in hash_index and key2 in hash_index:
+                    hash_difference = int(distances[hash_index[key1], hash_index[key2]])
+                    comparisons[comparison_key] = self._hash_similarity(hash_difference)
+                else:
+                    comparisons[comparison_key] = self._compare_image_data(downloads.get(url1), downloads.get(url2))
+        
+        return comparisons
+    
+    def _similar_pair_comparisons(self, image_urls: List[str], usernames: List[str],
+                                  content_keys: Dict[str, str], hashes: Dict[str, int]) -> Dict:
+        """Report only the similar pairs, found by BK-tree radius queries"""
+        users_by_key = {}
+        for i, url in enumerate(image_urls):
+            key = content_keys.get(url)
+            if key is not None:
+                users_by_key.setdefault(key, []).append(i)
+        
+        pairs = []
+        keys_by_hash = {}
+        for key, indices in users_by_key.items():
+            if key in hashes:
+                keys_by_hash.setdefault(hashes[key], []).append(key)
+            else:
+                # Identical downloads match even when they could not be hashed
+                pairs.extend((i, j, 0) for i in indices for j in indices if i < j)
+        
+        tree = _BKTree()
+        for hash_value in keys_by_hash:
+            tree.add(hash_value)
+        
+        for hash_value, keys in keys_by_hash.items():
+            for distance, match in tree.find(hash_value, _SIMILAR_MAX_DISTANCE):
+                for key1 in keys:
+                    for key2 in keys_by_hash[match]:
+                        # Byte-identical content needs no hash distance
+                        pair_distance = 0 if key1 == key2 else distance
+                        pairs.extend((i, j, pair_distance) for i in users_by_key[key1]
+                                     for j in users_by_key[key2] if i < j)
+        
+        comparisons = {}
+        for i, j, distance in sorted(pairs):
+            comparisons[f"{usernames[i]}_vs_{usernames[j]}"] = self._hash_similarity(distance)
+        return comparisons
+    
     def _generate_batch_summary(self, results: Dict, comparisons: Dict) -> Dict:
         """Generate summary of batch analysis"""
         total_images = len(results)
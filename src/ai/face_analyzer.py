@@ -1,9 +1,4 @@
-import requests
-import numpy as np
-from pathlib import Path
-from typing import List, Dict, Any
-from PIL import Image
-import io
+from typing import Dict, Any
 import random
 from utils.logger import setup_logger
 
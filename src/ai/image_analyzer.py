@@ -1,34 +1,102 @@
 import cv2
 import numpy as np
 from PIL import Image
-from PIL.ExifTags import TAGS
 import exifread
 import hashlib
+import io
 import requests
-from typing import Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Tuple
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Downloads larger than this are abandoned instead of buffered
+MAX_IMAGE_BYTES = 25_000_000
+
 class ImageAnalyzer:
-    def __init__(self):
-        pass
+    def __init__(self, max_retries: int = 0):
+        # Keep-alive connections shared by every download this analyzer makes;
+        # failed requests are not retried unless max_retries is set
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=max_retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def _load_image(self, image_url: str) -> Tuple[bytearray, Dict[str, str], Image.Image]:
+        """Download and open an image once, returning (bytes, hex digests, image)"""
+        # Hash while streaming so hashing overlaps the download
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        image_data = bytearray()
+        with self.session.get(image_url, timeout=10, stream=True) as response:
+            # Reject oversized and non-image responses before reading the body
+            if int(response.headers.get('Content-Length') or 0) > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+            content_type = response.headers.get('Content-Type', '')
+            if not content_type.startswith('image/'):
+                raise ValueError(f"Not an image (Content-Type: {content_type or 'missing'})")
+            for chunk in response.iter_content(65536):
+                md5.update(chunk)
+                sha256.update(chunk)
+                image_data.extend(chunk)
+                if len(image_data) > MAX_IMAGE_BYTES:
+                    raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+        
+        digests = {'md5': md5.hexdigest(), 'sha256': sha256.hexdigest()}
+        return image_data, digests, Image.open(io.BytesIO(image_data))
+    
+    def analyze_all(self, image_url: str) -> Dict[str, Any]:
+        """EXIF data, properties and search hashes of one image, downloaded and decoded once"""
+        try:
+            loaded = self._load_image(image_url)
+        except Exception as e:
+            logger.error(f"Image download error: {e}")
+            return {'error': str(e)}
+        
+        return {
+            'exif': self._exif_data(loaded),
+            'properties': self._image_properties(loaded),
+            'hashes': self._search_hashes(loaded)
+        }
     
     def extract_exif_data(self, image_url: str) -> Dict[str, Any]:
         """Extract EXIF metadata from image"""
         try:
-            response = requests.get(image_url, timeout=10)
-            image = Image.open(response.content)
-            
-            exif_data = {}
-            if hasattr(image, '_getexif'):
-                exif = image._getexif()
-                if exif:
-                    for tag_id, value in exif.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        exif_data[tag] = str(value)
-            
-            # Additional metadata
+            loaded = self._load_image(image_url)
+        except Exception as e:
+            logger.error(f"EXIF extraction error: {e}")
+            return {'error': str(e)}
+        return self._exif_data(loaded)
+    
+    def analyze_image_properties(self, image_url: str) -> Dict[str, Any]:
+        """Analyze image properties and detect modifications"""
+        try:
+            loaded = self._load_image(image_url)
+        except Exception as e:
+            logger.error(f"Image analysis error: {e}")
+            return {'error': str(e)}
+        return self._image_properties(loaded)
+    
+    def reverse_image_search_hash(self, image_url: str) -> Dict[str, Any]:
+        """Generate hashes for reverse image search"""
+        try:
+            loaded = self._load_image(image_url)
+        except Exception as e:
+            logger.error(f"Hash generation error: {e}")
+            return {'error': str(e)}
+        return self._search_hashes(loaded)
+    
+    def _exif_data(self, loaded: Tuple[bytearray, Dict[str, str], Image.Image]) -> Dict[str, Any]:
+        """EXIF metadata of a loaded image"""
+        try:
+            image_data, _, image = loaded
+            
+            # Parse only the EXIF segment - no pixel decode, MakerNote or thumbnail
+            tags = exifread.process_file(io.BytesIO(image_data), details=False, extract_thumbnail=False)
+            exif_data = {tag: str(value) for tag, value in tags.items()}
+            
+            # Additional metadata (read lazily from the header)
             metadata = {
                 'format': image.format,
                 'mode': image.mode,
@@ -38,7 +106,7 @@ class ImageAnalyzer:
             }
             
             # Extract GPS if available
-            gps_info = self._extract_gps_info(exif_data)
+            gps_info = self._extract_gps_info(tags)
             if gps_info:
                 metadata['gps_coordinates'] = gps_info
             
@@ -48,28 +116,23 @@ class ImageAnalyzer:
             logger.error(f"EXIF extraction error: {e}")
             return {'error': str(e)}
     
-    def analyze_image_properties(self, image_url: str) -> Dict[str, Any]:
-        """Analyze image properties and detect modifications"""
+    def _image_properties(self, loaded: Tuple[bytearray, Dict[str, str], Image.Image]) -> Dict[str, Any]:
+        """Properties and modification signs of a loaded image"""
         try:
-            response = requests.get(image_url, timeout=10)
-            image_data = response.content
-            
-            # Calculate hash
-            image_hash = hashlib.md5(image_data).hexdigest()
-            
-            # Load image
-            image = Image.open(io.BytesIO(image_data))
+            image_data, digests, image = loaded
             image_array = np.array(image)
+            compression_artifacts, noise_level = self._gradient_statistics(self._to_grayscale(image_array))
             
             # Basic analysis
             analysis = {
                 'file_size': len(image_data),
-                'hash_md5': image_hash,
+                'hash_md5': digests['md5'],
+                'hash_sha256': digests['sha256'],
                 'dimensions': image.size,
                 'color_channels': len(image_array.shape),
                 'bit_depth': image_array.dtype,
-                'compression_artifacts': self._detect_compression_artifacts(image_array),
-                'noise_level': self._calculate_noise_level(image_array)
+                'compression_artifacts': compression_artifacts,
+                'noise_level': noise_level
             }
             
             return analysis
@@ -78,27 +141,24 @@ class ImageAnalyzer:
             logger.error(f"Image analysis error: {e}")
             return {'error': str(e)}
     
-    def reverse_image_search_hash(self, image_url: str) -> Dict[str, Any]:
-        """Generate hashes for reverse image search"""
+    def _search_hashes(self, loaded: Tuple[bytearray, Dict[str, str], Image.Image]) -> Dict[str, Any]:
+        """Reverse image search hashes of a loaded image"""
         try:
-            response = requests.get(image_url, timeout=10)
-            image = Image.open(io.BytesIO(response.content))
+            image_data, _, _ = loaded
+            
+            # Decode a fresh copy so JPEGs can be decoded straight to a
+            # small grayscale draft instead of full-resolution RGB
+            image = Image.open(io.BytesIO(image_data))
+            image.draft('L', (64, 64))
             
             # Convert to grayscale and resize
-            gray = image.convert('L').resize((8, 8))
-            pixels = list(gray.getdata())
+            pixels = np.asarray(image.convert('L').resize((8, 8)), dtype=np.uint8)
             
             # Calculate average hash
-            avg = sum(pixels) / len(pixels)
-            hash_bits = ''.join('1' if pixel > avg else '0' for pixel in pixels)
+            hash_bits = self._bits_to_string(pixels > pixels.mean())
             
             # Difference hash
-            dhash_bits = ''
-            for i in range(8):
-                for j in range(7):
-                    idx1 = i * 8 + j
-                    idx2 = i * 8 + j + 1
-                    dhash_bits += '1' if pixels[idx1] > pixels[idx2] else '0'
+            dhash_bits = self._bits_to_string(pixels[:, :-1] > pixels[:, 1:])
             
             return {
                 'average_hash': hash_bits,
@@ -111,22 +171,24 @@ class ImageAnalyzer:
             logger.error(f"Hash generation error: {e}")
             return {'error': str(e)}
     
-    def _extract_gps_info(self, exif_data: Dict[str, Any]) -> Dict[str, float]:
-        """Extract GPS coordinates from EXIF data"""
+    def _bits_to_string(self, bits: np.ndarray) -> str:
+        """Render a boolean array as a string of '0'/'1' characters"""
+        return (bits.ravel().astype(np.uint8) + ord('0')).tobytes().decode('ascii')
+    
+    def _extract_gps_info(self, tags: Dict[str, Any]) -> Dict[str, float]:
+        """Extract GPS coordinates from exifread tags"""
         try:
-            if 'GPSInfo' in exif_data:
-                gps_info = exif_data['GPSInfo']
-                
-                def convert_to_degrees(value):
-                    d, m, s = value
+            if 'GPS GPSLatitude' in tags and 'GPS GPSLongitude' in tags:
+                def convert_to_degrees(tag):
+                    d, m, s = (float(v) for v in tag.values)
                     return d + (m / 60.0) + (s / 3600.0)
                 
-                lat = convert_to_degrees(gps_info.get('GPSLatitude', [0, 0, 0]))
-                lon = convert_to_degrees(gps_info.get('GPSLongitude', [0, 0, 0]))
+                lat = convert_to_degrees(tags['GPS GPSLatitude'])
+                lon = convert_to_degrees(tags['GPS GPSLongitude'])
                 
-                if gps_info.get('GPSLatitudeRef') == 'S':
+                if str(tags.get('GPS GPSLatitudeRef')) == 'S':
                     lat = -lat
-                if gps_info.get('GPSLongitudeRef') == 'W':
+                if str(tags.get('GPS GPSLongitudeRef')) == 'W':
                     lon = -lon
                 
                 return {'latitude': lat, 'longitude': lon}
@@ -134,41 +196,27 @@ class ImageAnalyzer:
             pass
         return {}
     
-    def _detect_compression_artifacts(self, image_array: np.ndarray) -> float:
-        """Detect JPEG compression artifacts"""
-        try:
-            # Convert to grayscale if needed
-            if len(image_array.shape) == 3:
-                gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image_array
-            
-            # Calculate gradient magnitude
-            grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-            grad_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-            magnitude = np.sqrt(grad_x**2 + grad_y**2)
-            
-            # Compression artifacts typically show as high frequency noise
-            return float(np.std(magnitude))
-            
-        except Exception as e:
-            logger.error(f"Compression detection error: {e}")
-            return 0.0
+    def _to_grayscale(self, image_array: np.ndarray) -> np.ndarray:
+        """Convert an RGB(A) array to grayscale, passing gray input through"""
+        if len(image_array.shape) == 3:
+            if image_array.shape[2] == 4:
+                return cv2.cvtColor(image_array, cv2.COLOR_RGBA2GRAY)
+            return cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
+        return image_array
     
-    def _calculate_noise_level(self, image_array: np.ndarray) -> float:
-        """Calculate noise level in image"""
+    def _gradient_statistics(self, gray: np.ndarray) -> Tuple[float, float]:
+        """Compression artifact spread and noise level of a grayscale image"""
         try:
-            if len(image_array.shape) == 3:
-                gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image_array
+            # Gradient magnitude spread - compression artifacts show as high frequency noise
+            grad_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+            grad_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+            _, artifact_std = cv2.meanStdDev(cv2.magnitude(grad_x, grad_y))
             
-            # Use Laplacian to detect noise
-            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-            noise_level = laplacian.var()
+            # Laplacian variance as the noise level
+            _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
             
-            return float(noise_level)
+            return float(artifact_std[0, 0]), float(laplacian_std[0, 0]) ** 2
             
         except Exception as e:
-            logger.error(f"Noise calculation error: {e}")
-            return 0.0
\ No newline at end of file
+            logger.error(f"Gradient statistics error: {e}")
+            return 0.0, 0.0
@@ -1,17 +1,33 @@
+import os
 import numpy as np
+import pandas as pd
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
 import re
-from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity
+import functools
 import hashlib
-from typing import Dict, List, Any, Tuple
+import math
+from typing import Dict, List, Any, Optional, Tuple
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENT_RE = re.compile(r'[.!?]+')
+_PUNCT_RE = re.compile(r'[.!?]')
+
+# Below this many values plain Python sums beat NumPy's per-call overhead
+_SMALL_SERIES = 64
+
+# Smaller profiles are analyzed in-process; pool startup and pickling would cost more
+_PARALLEL_MIN_POSTS = 100
+
+_DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 class AdvancedSocialAnalyzer:
     def __init__(self):
         self.personality_keywords = {
@@ -21,7 +37,39 @@ class AdvancedSocialAnalyzer:
             'conscientiousness': ['plan', 'organize', 'schedule', 'goal', 'achieve', 'work'],
             'agreeableness': ['help', 'kind', 'support', 'care', 'love', 'family']
         }
+        # One pass over the text finds every keyword; the lookahead lets matches overlap
+        self._keyword_traits = {keyword: trait for trait, keywords in self.personality_keywords.items()
+                                for keyword in keywords}
+        self._keyword_re = re.compile('(?=(' + '|'.join(
+            re.escape(keyword) for keyword in sorted(self._keyword_traits, key=len, reverse=True)) + '))')
+        # Refit per call, but float32 halves the matrix and speeds up the similarity product
+        self._diversity_vectorizer = TfidfVectorizer(max_features=100, stop_words='english', dtype=np.float32)
+        # Anomaly and evolution passes score the same posts, and reposts repeat text
+        self._polarity = functools.lru_cache(maxsize=4096)(self._score_polarity)
+        # Parsed fields of the most recently analyzed posts list, see _prepare()
+        self._prepared = None
+        
+    def run_all(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run every analysis on a profile, in worker processes for large profiles"""
+        posts = profile_data.get('posts', [])
+        tasks = {
+            'authenticity': ('analyze_profile_authenticity', profile_data),
+            'personality': ('analyze_personality_traits', posts),
+            'behavioral': ('analyze_behavioral_patterns', posts),
+            'social': ('analyze_social_connections', posts),
+            'evolution': ('analyze_content_evolution', posts),
+            'influence': ('analyze_influence_network', posts),
+            'anomalies': ('detect_anomalies', posts)
+        }
+        
+        if len(posts) < _PARALLEL_MIN_POSTS:
+            return {name: getattr(self, method)(argument) for name, (method, argument) in tasks.items()}
         
+        with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+            futures = {name: executor.submit(_run_analysis, method, argument)
+                       for name, (method, argument) in tasks.items()}
+            return {name: future.result() for name, future in futures.items()}
+    
     def analyze_profile_authenticity(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect fake profiles using multiple indicators"""
         profile = profile_data.get('profile', {})
@@ -46,12 +94,10 @@ class AdvancedSocialAnalyzer:
         
         # Post frequency analysis
         if posts:
-            post_dates = [p.get('date') for p in posts if p.get('date')]
-            if len(post_dates) > 1:
-                intervals = self._calculate_posting_intervals(post_dates)
-                if self._detect_bot_patterns(intervals):
-                    authenticity_score -= 25
-                    red_flags.append('Bot-like posting pattern')
+            intervals = self._get_posting_intervals(posts)
+            if self._detect_bot_patterns(intervals):
+                authenticity_score -= 25
+                red_flags.append('Bot-like posting pattern')
         
         # Content diversity
         content_diversity = self._analyze_content_diversity(posts)
@@ -67,14 +113,19 @@ class AdvancedSocialAnalyzer:
     
     def analyze_personality_traits(self, posts: List[Dict[str, Any]]) -> Dict[str, float]:
         """Extract Big Five personality traits from content"""
-        all_text = ' '.join([p.get('caption', '') or p.get('content', '') for p in posts])
+        all_text = ' '.join(self._prepare(posts)['contents']).lower()
+        
+        scores = dict.fromkeys(self.personality_keywords, 0)
+        keyword_end = {}
+        for match in self._keyword_re.finditer(all_text):
+            keyword = match.group(1)
+            # Count each keyword without overlapping itself, as str.count does
+            if match.start() >= keyword_end.get(keyword, 0):
+                scores[self._keyword_traits[keyword]] += 1
+                keyword_end[keyword] = match.start() + len(keyword)
         
         trait_scores = {}
-        for trait, keywords in self.personality_keywords.items():
-            score = 0
-            for keyword in keywords:
-                score += all_text.lower().count(keyword)
-            
+        for trait, score in scores.items():
             # Normalize score
             trait_scores[trait] = min(1.0, score / max(1, len(posts)))
         
@@ -86,18 +137,13 @@ class AdvancedSocialAnalyzer:
             return {}
         
         # Time-based patterns
-        hour_activity = defaultdict(int)
-        day_activity = defaultdict(int)
-        
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    hour_activity[dt.hour] += 1
-                    day_activity[dt.strftime('%A')] += 1
-                except:
-                    continue
+        dates = self._prepare(posts)['dates']
+        dates = dates[~np.isnat(dates)]
+        hour_counts = np.bincount(dates.astype('datetime64[h]').astype(np.int64) % 24, minlength=24)
+        # 1970-01-01 was a Thursday, so shifting by 3 puts Monday at 0
+        day_counts = np.bincount((dates.astype('datetime64[D]').astype(np.int64) + 3) % 7, minlength=7)
+        hour_activity = {int(hour): int(hour_counts[hour]) for hour in np.flatnonzero(hour_counts)}
+        day_activity = {_DAY_NAMES[day]: int(day_counts[day]) for day in np.flatnonzero(day_counts)}
         
         # Device/platform patterns
         platform_usage = self._analyze_platform_patterns(posts)
@@ -107,9 +153,9 @@ class AdvancedSocialAnalyzer:
         
         return {
             'time_patterns': {
-                'most_active_hour': max(hour_activity, key=hour_activity.get) if hour_activity else None,
-                'most_active_day': max(day_activity, key=day_activity.get) if day_activity else None,
-                'activity_distribution': dict(hour_activity)
+                'most_active_hour': int(hour_counts.argmax()) if hour_activity else None,
+                'most_active_day': _DAY_NAMES[day_counts.argmax()] if day_activity else None,
+                'activity_distribution': hour_activity
             },
             'platform_patterns': platform_usage,
             'content_patterns': content_patterns,
@@ -150,32 +196,29 @@ class AdvancedSocialAnalyzer:
             return {}
         
         # Sort posts by date
-        dated_posts = []
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    dated_posts.append((dt, post))
-                except:
-                    continue
-        
-        dated_posts.sort(key=lambda x: x[0])
+        prepared = self._prepare(posts)
+        dates = prepared['dates']
+        order = [i for i in np.argsort(dates, kind='stable') if not np.isnat(dates[i])]
+        dated_contents = [prepared['contents'][i] for i in order]
+        # Tokenize each post once for the topic and maturity passes
+        if 'tokens' not in prepared:
+            prepared['tokens'] = [_WORD_RE.findall(content.lower()) for content in prepared['contents']]
+        dated_tokens = [prepared['tokens'][i] for i in order]
         
         # Analyze sentiment evolution
-        sentiment_evolution = self._analyze_sentiment_evolution(dated_posts)
+        sentiment_evolution = self._analyze_sentiment_evolution(dated_contents)
         
         # Analyze topic evolution
-        topic_evolution = self._analyze_topic_evolution(dated_posts)
+        topic_evolution = self._analyze_topic_evolution(dated_tokens)
         
         # Analyze language evolution
-        language_evolution = self._analyze_language_evolution(dated_posts)
+        language_evolution = self._analyze_language_evolution(dated_contents)
         
         return {
             'sentiment_evolution': sentiment_evolution,
             'topic_evolution': topic_evolution,
             'language_evolution': language_evolution,
-            'content_maturity': self._calculate_content_maturity(dated_posts)
+            'content_maturity': self._calculate_content_maturity(dated_contents, dated_tokens)
         }
     
     def analyze_influence_network(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -184,9 +227,8 @@ class AdvancedSocialAnalyzer:
         original_content_ratio = 0
         influence_indicators = []
         
-        for post in posts:
-            content = post.get('caption', '') or post.get('content', '')
-            
+        prepared = self._prepare(posts)
+        for post, content in zip(posts, prepared['contents']):
             # Check for repost indicators
             if any(indicator in content.lower() for indicator in ['rt @', 'repost', 'via @', 'credit:']):
                 repost_patterns.append(post)
@@ -196,13 +238,14 @@ class AdvancedSocialAnalyzer:
         original_content_ratio = original_content_ratio / len(posts) if posts else 0
         
         # Analyze engagement patterns
-        engagement_analysis = self._analyze_engagement_patterns(posts)
+        likes, comments = prepared['likes'], prepared['comments']
+        engagement_analysis = self._analyze_engagement_patterns(likes, comments)
         
         return {
             'original_content_ratio': original_content_ratio,
             'repost_frequency': len(repost_patterns) / len(posts) if posts else 0,
             'engagement_analysis': engagement_analysis,
-            'influence_score': self._calculate_influence_score(posts, original_content_ratio)
+            'influence_score': self._calculate_influence_score(likes, comments, original_content_ratio)
         }
     
     def detect_anomalies(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -213,52 +256,30 @@ class AdvancedSocialAnalyzer:
             return {'anomalies': anomalies}
         
         # Posting frequency anomalies
-        posting_intervals = self._get_posting_intervals(posts)
-        if posting_intervals:
-            avg_interval = np.mean(posting_intervals)
-            std_interval = np.std(posting_intervals)
-            
-            for i, interval in enumerate(posting_intervals):
-                if abs(interval - avg_interval) > 2 * std_interval:
-                    anomalies.append({
-                        'type': 'posting_frequency',
-                        'description': f'Unusual posting interval: {interval:.2f} hours',
-                        'post_index': i
-                    })
+        posting_intervals = np.asarray(self._get_posting_intervals(posts), dtype=np.float64)
+        anomalies.extend({
+            'type': 'posting_frequency',
+            'description': f'Unusual posting interval: {posting_intervals[i]:.2f} hours',
+            'post_index': int(i)
+        } for i in self._outlier_indices(posting_intervals))
+        
+        contents = self._prepare(posts)['contents']
         
         # Content length anomalies
-        content_lengths = [len(p.get('caption', '') or p.get('content', '')) for p in posts]
-        if content_lengths:
-            avg_length = np.mean(content_lengths)
-            std_length = np.std(content_lengths)
-            
-            for i, length in enumerate(content_lengths):
-                if abs(length - avg_length) > 2 * std_length:
-                    anomalies.append({
-                        'type': 'content_length',
-                        'description': f'Unusual content length: {length} characters',
-                        'post_index': i
-                    })
+        content_lengths = np.fromiter(map(len, contents), dtype=np.int64, count=len(contents))
+        anomalies.extend({
+            'type': 'content_length',
+            'description': f'Unusual content length: {content_lengths[i]} characters',
+            'post_index': int(i)
+        } for i in self._outlier_indices(content_lengths))
         
         # Sentiment anomalies
-        sentiments = []
-        for post in posts:
-            content = post.get('caption', '') or post.get('content', '')
-            if content:
-                sentiment = TextBlob(content).sentiment.polarity
-                sentiments.append(sentiment)
-        
-        if sentiments:
-            avg_sentiment = np.mean(sentiments)
-            std_sentiment = np.std(sentiments)
-            
-            for i, sentiment in enumerate(sentiments):
-                if abs(sentiment - avg_sentiment) > 2 * std_sentiment:
-                    anomalies.append({
-                        'type': 'sentiment',
-                        'description': f'Unusual sentiment: {sentiment:.2f}',
-                        'post_index': i
-                    })
+        sentiments = self._batch_sentiment(contents)
+        anomalies.extend({
+            'type': 'sentiment',
+            'description': f'Unusual sentiment: {sentiments[i]:.2f}',
+            'post_index': int(i)
+        } for i in self._outlier_indices(sentiments))
         
         return {
             'anomalies': anomalies,
@@ -266,24 +287,61 @@ class AdvancedSocialAnalyzer:
             'risk_score': min(100, len(anomalies) * 10)
         }
     
-    def _calculate_posting_intervals(self, post_dates: List[str]) -> List[float]:
+    def _prepare(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Per-post fields shared by every analysis of the same posts list"""
+        # Holding the list keeps its id from being reused; posts are not mutated while analyzed
+        if self._prepared is not None and self._prepared[0] is posts and self._prepared[1] == len(posts):
+            return self._prepared[2]
+        
+        likes, comments = self._engagement_arrays(posts)
+        prepared = {
+            'contents': self._extract_contents(posts),
+            'dates': self._parse_dates([post.get('date') for post in posts]),
+            'likes': likes,
+            'comments': comments
+        }
+        self._prepared = (posts, len(posts), prepared)
+        return prepared
+    
+    def _extract_contents(self, posts: List[Dict[str, Any]]) -> List[str]:
+        """Text of each post, from its caption or content field"""
+        return [post.get('caption') or post.get('content') or '' for post in posts]
+    
+    def _mean_std(self, values) -> Tuple[float, float]:
+        """Mean and population standard deviation of a non-empty series"""
+        if len(values) >= _SMALL_SERIES:
+            values = np.asarray(values, dtype=np.float64)
+            return values.mean(), values.std()
+        
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        mean = math.fsum(values) / len(values)
+        return mean, math.sqrt(math.fsum((value - mean) ** 2 for value in values) / len(values))
+    
+    def _outlier_indices(self, values: np.ndarray) -> np.ndarray:
+        """Indices of values more than two standard deviations from the mean"""
+        if not values.size:
+            return values.astype(np.intp)
+        return np.flatnonzero(np.abs(values - values.mean()) > 2 * values.std())
+    
+    def _score_polarity(self, text: str) -> float:
+        """Polarity of one text, scored straight against the pattern lexicon"""
+        # Same score as TextBlob(text).sentiment.polarity without building a blob
+        return pattern_sentiment(text)[0]
+    
+    def _batch_sentiment(self, texts: List[str]) -> np.ndarray:
+        """Polarity of every non-empty text"""
+        return np.asarray([self._polarity(text) for text in texts if text], dtype=np.float64)
+    
+    def _parse_dates(self, date_strings: List[Optional[str]]) -> np.ndarray:
+        """Parse ISO-8601 dates in one batch as UTC datetime64, NaT where unparseable"""
+        return pd.to_datetime(pd.Series(date_strings, dtype=object), utc=True,
+                              format='ISO8601', errors='coerce').dt.tz_localize(None).to_numpy()
+    
+    def _calculate_posting_intervals(self, dates: np.ndarray) -> List[float]:
         """Calculate intervals between posts in hours"""
-        intervals = []
-        dates = []
-        
-        for date_str in post_dates:
-            try:
-                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                dates.append(dt)
-            except:
-                continue
-        
-        dates.sort()
-        for i in range(1, len(dates)):
-            interval = (dates[i] - dates[i-1]).total_seconds() / 3600
-            intervals.append(interval)
-        
-        return intervals
+        dates = np.sort(dates[~np.isnat(dates)])
+        return (np.diff(dates) / np.timedelta64(1, 'h')).tolist()
     
     def _detect_bot_patterns(self, intervals: List[float]) -> bool:
         """Detect bot-like posting patterns"""
@@ -291,47 +349,36 @@ class AdvancedSocialAnalyzer:
             return False
         
         # Check for too regular intervals
-        std_dev = np.std(intervals)
-        mean_interval = np.mean(intervals)
+        mean_interval, std_dev = self._mean_std(intervals)
         
         # Very regular posting (low variance) might indicate bot
         if std_dev < mean_interval * 0.1 and mean_interval < 1:  # Less than 1 hour
             return True
         
         # Check for burst patterns
-        short_intervals = [i for i in intervals if i < 0.1]  # Less than 6 minutes
-        if len(short_intervals) > len(intervals) * 0.3:
-            return True
-        
-        return False
+        short_intervals = sum(1 for interval in intervals if interval < 0.1)  # Less than 6 minutes
+        return short_intervals > len(intervals) * 0.3
     
     def _analyze_content_diversity(self, posts: List[Dict[str, Any]]) -> float:
         """Calculate content diversity score"""
         if not posts:
             return 0
         
-        contents = []
-        for post in posts:
-            content = post.get('caption', '') or post.get('content', '')
-            if content:
-                contents.append(content)
+        contents = [content for content in self._prepare(posts)['contents'] if content]
         
         if len(contents) < 2:
             return 0
         
         # Use TF-IDF to measure content similarity
         try:
-            vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform(contents)
+            tfidf_matrix = self._diversity_vectorizer.fit_transform(contents)
             
-            # Calculate average pairwise similarity
-            similarities = []
-            for i in range(len(contents)):
-                for j in range(i+1, len(contents)):
-                    sim = cosine_similarity(tfidf_matrix[i], tfidf_matrix[j])[0][0]
-                    similarities.append(sim)
-            
-            avg_similarity = np.mean(similarities) if similarities else 0
+            # Rows are L2-normalized, so pairwise cosines are dot products; their sum over
+            # all ordered pairs is |sum of rows|^2 minus each row's own |row|^2
+            count = len(contents)
+            row_sum = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+            self_similarity = tfidf_matrix.multiply(tfidf_matrix).sum()
+            avg_similarity = (row_sum @ row_sum - self_similarity) / (count * (count - 1))
             diversity_score = 1 - avg_similarity
             
             return max(0, min(1, diversity_score))
@@ -350,17 +397,15 @@ class AdvancedSocialAnalyzer:
     
     def _analyze_content_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze content type and style patterns"""
-        content_types = {'text': 0, 'image': 0, 'video': 0, 'link': 0}
+        is_video = np.fromiter((bool(p.get('is_video')) for p in posts), dtype=bool, count=len(posts))
+        has_url = np.fromiter((bool(p.get('url')) for p in posts), dtype=bool, count=len(posts))
+        has_text = np.fromiter((bool(p.get('caption') or p.get('content')) for p in posts), dtype=bool, count=len(posts))
         
-        for post in posts:
-            if post.get('is_video'):
-                content_types['video'] += 1
-            elif post.get('url'):
-                content_types['link'] += 1
-            elif post.get('caption') or post.get('content'):
-                content_types['text'] += 1
-            else:
-                content_types['image'] += 1
+        # Video beats link beats text; anything else is an image post
+        video = int(is_video.sum())
+        link = int((~is_video & has_url).sum())
+        text = int((~is_video & ~has_url & has_text).sum())
+        content_types = {'text': text, 'image': len(posts) - video - link - text, 'video': video, 'link': link}
         
         total = sum(content_types.values())
         if total > 0:
@@ -374,8 +419,8 @@ class AdvancedSocialAnalyzer:
             return 0
         
         # Calculate variance in posting times
-        hour_variance = np.var(list(hour_activity.values())) if hour_activity else 0
-        day_variance = np.var(list(day_activity.values())) if day_activity else 0
+        hour_variance = self._mean_std(list(hour_activity.values()))[1] ** 2
+        day_variance = self._mean_std(list(day_activity.values()))[1] ** 2
         
         # Higher variance = less routine
         routine_score = 1 / (1 + hour_variance + day_variance)
@@ -385,60 +430,51 @@ class AdvancedSocialAnalyzer:
         """Detect communities based on mentions and hashtags"""
         communities = []
         
-        # Group by common hashtags
-        hashtag_groups = defaultdict(list)
-        for hashtag in set(hashtags):
-            if hashtags.count(hashtag) > 1:
-                hashtag_groups[hashtag] = [m for m in mentions if hashtag in hashtags]
+        # Every recurring hashtag groups the profile's mentions
+        if len(mentions) <= 2:
+            return communities
+        members = list(set(mentions))
         
-        for hashtag, members in hashtag_groups.items():
-            if len(members) > 2:
+        for hashtag, count in Counter(hashtags).items():
+            if count > 1:
                 communities.append({
                     'type': 'hashtag_community',
                     'identifier': hashtag,
-                    'members': list(set(members)),
-                    'strength': len(members)
+                    'members': list(members),
+                    'strength': len(mentions)
                 })
         
         return communities
     
-    def _analyze_sentiment_evolution(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_sentiment_evolution(self, dated_contents: List[str]) -> Dict[str, Any]:
         """Analyze how sentiment changes over time"""
-        sentiments = []
-        dates = []
-        
-        for date, post in dated_posts:
-            content = post.get('caption', '') or post.get('content', '')
-            if content:
-                sentiment = TextBlob(content).sentiment.polarity
-                sentiments.append(sentiment)
-                dates.append(date)
+        sentiments = self._batch_sentiment(dated_contents)
         
         if len(sentiments) < 2:
             return {}
         
-        # Calculate trend
-        x = np.arange(len(sentiments))
-        trend = np.polyfit(x, sentiments, 1)[0]
+        # Calculate trend (least-squares slope in closed form)
+        x = np.arange(len(sentiments), dtype=np.float64)
+        x -= x.mean()
+        average_sentiment = sentiments.mean()
+        trend = (x * (sentiments - average_sentiment)).sum() / (x * x).sum()
         
         return {
             'sentiment_trend': 'improving' if trend > 0.01 else 'declining' if trend < -0.01 else 'stable',
             'trend_strength': abs(trend),
-            'average_sentiment': np.mean(sentiments),
-            'sentiment_volatility': np.std(sentiments)
+            'average_sentiment': average_sentiment,
+            'sentiment_volatility': sentiments.std()
         }
     
-    def _analyze_topic_evolution(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_topic_evolution(self, dated_tokens: List[List[str]]) -> Dict[str, Any]:
         """Analyze how topics change over time"""
         # Simple topic analysis using keyword frequency
-        early_posts = dated_posts[:len(dated_posts)//2]
-        recent_posts = dated_posts[len(dated_posts)//2:]
-        
-        early_text = ' '.join([post.get('caption', '') or post.get('content', '') for _, post in early_posts])
-        recent_text = ' '.join([post.get('caption', '') or post.get('content', '') for _, post in recent_posts])
-        
-        early_words = Counter(re.findall(r'\b\w+\b', early_text.lower()))
-        recent_words = Counter(re.findall(r'\b\w+\b', recent_text.lower()))
+        early_words = Counter()
+        for tokens in dated_tokens[:len(dated_tokens)//2]:
+            early_words.update(tokens)
+        recent_words = Counter()
+        for tokens in dated_tokens[len(dated_tokens)//2:]:
+            recent_words.update(tokens)
         
         # Find emerging and declining topics
         emerging_topics = []
@@ -458,63 +494,60 @@ class AdvancedSocialAnalyzer:
             'topic_stability': len(set(early_words.keys()) & set(recent_words.keys())) / max(1, len(set(early_words.keys()) | set(recent_words.keys())))
         }
     
-    def _analyze_language_evolution(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_language_evolution(self, dated_contents: List[str]) -> Dict[str, Any]:
         """Analyze language and writing style evolution"""
-        early_posts = dated_posts[:len(dated_posts)//2]
-        recent_posts = dated_posts[len(dated_posts)//2:]
-        
-        early_text = ' '.join([post.get('caption', '') or post.get('content', '') for _, post in early_posts])
-        recent_text = ' '.join([post.get('caption', '') or post.get('content', '') for _, post in recent_posts])
-        
         # Calculate readability and complexity metrics
-        early_complexity = self._calculate_text_complexity(early_text)
-        recent_complexity = self._calculate_text_complexity(recent_text)
+        early_complexity = self._calculate_text_complexity(dated_contents[:len(dated_contents)//2])
+        recent_complexity = self._calculate_text_complexity(dated_contents[len(dated_contents)//2:])
         
         return {
             'complexity_change': recent_complexity - early_complexity,
             'language_maturity': 'improving' if recent_complexity > early_complexity else 'declining' if recent_complexity < early_complexity else 'stable'
         }
     
-    def _calculate_content_maturity(self, dated_posts: List[Tuple]) -> float:
+    def _calculate_content_maturity(self, dated_contents: List[str], dated_tokens: List[List[str]]) -> float:
         """Calculate overall content maturity score"""
-        if len(dated_posts) < 2:
+        if len(dated_contents) < 2:
             return 0.5
         
         # Analyze various maturity indicators
         maturity_indicators = []
         
-        for _, post in dated_posts:
-            content = post.get('caption', '') or post.get('content', '')
+        for content, words in zip(dated_contents, dated_tokens):
             if content:
                 # Length indicator
                 length_score = min(1, len(content) / 200)
                 
                 # Punctuation usage
-                punct_score = len(re.findall(r'[.!?]', content)) / max(1, len(content.split()))
+                punct_score = len(_PUNCT_RE.findall(content)) / max(1, len(content.split()))
                 
                 # Vocabulary diversity
-                words = re.findall(r'\b\w+\b', content.lower())
                 vocab_score = len(set(words)) / max(1, len(words)) if words else 0
                 
                 maturity_indicators.append((length_score + punct_score + vocab_score) / 3)
         
         return np.mean(maturity_indicators) if maturity_indicators else 0.5
     
-    def _analyze_engagement_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _engagement_arrays(self, posts: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Likes and comments of every post as arrays"""
+        likes = np.fromiter((p.get('likes') or p.get('like_count') or 0 for p in posts),
+                            dtype=np.float64, count=len(posts))
+        comments = np.fromiter((p.get('comments') or p.get('reply_count') or 0 for p in posts),
+                               dtype=np.float64, count=len(posts))
+        return likes, comments
+    
+    def _analyze_engagement_patterns(self, likes: np.ndarray, comments: np.ndarray) -> Dict[str, Any]:
         """Analyze engagement patterns and quality"""
-        likes = [p.get('likes', 0) or p.get('like_count', 0) for p in posts]
-        comments = [p.get('comments', 0) or p.get('reply_count', 0) for p in posts]
-        
-        if not likes and not comments:
+        if not likes.size:
             return {}
         
         # Calculate engagement metrics
-        avg_likes = np.mean(likes) if likes else 0
-        avg_comments = np.mean(comments) if comments else 0
+        avg_likes, std_likes = self._mean_std(likes)
+        avg_comments, std_comments = self._mean_std(comments)
         
         # Engagement consistency
-        like_consistency = 1 - (np.std(likes) / max(1, avg_likes)) if likes else 0
-        comment_consistency = 1 - (np.std(comments) / max(1, avg_comments)) if comments else 0
+        like_consistency = 1 - (std_likes / max(1, avg_likes))
+        comment_consistency = 1 - (std_comments / max(1, avg_comments))
         
         return {
             'average_likes': avg_likes,
@@ -523,61 +556,56 @@ class AdvancedSocialAnalyzer:
             'engagement_ratio': avg_comments / max(1, avg_likes) if avg_likes > 0 else 0
         }
     
-    def _calculate_influence_score(self, posts: List[Dict[str, Any]], original_ratio: float) -> float:
+    def _calculate_influence_score(self, likes: np.ndarray, comments: np.ndarray, original_ratio: float) -> float:
         """Calculate overall influence score"""
-        if not posts:
+        post_count = likes.size
+        if not post_count:
             return 0
         
         # Base score from original content ratio
         base_score = original_ratio * 50
         
         # Engagement bonus
-        total_engagement = sum([
-            (p.get('likes', 0) or p.get('like_count', 0)) + 
-            (p.get('comments', 0) or p.get('reply_count', 0))
-            for p in posts
-        ])
-        engagement_score = min(30, total_engagement / len(posts) / 10)
+        total_engagement = likes.sum() + comments.sum()
+        engagement_score = min(30, total_engagement / post_count / 10)
         
         # Consistency bonus
-        consistency_score = 20 if len(posts) > 10 else len(posts) * 2
+        consistency_score = 20 if post_count > 10 else post_count * 2
         
         return min(100, base_score + engagement_score + consistency_score)
     
     def _get_posting_intervals(self, posts: List[Dict[str, Any]]) -> List[float]:
         """Get posting intervals in hours"""
-        dates = []
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    dates.append(dt)
-                except:
-                    continue
-        
-        dates.sort()
-        intervals = []
-        for i in range(1, len(dates)):
-            interval = (dates[i] - dates[i-1]).total_seconds() / 3600
-            intervals.append(interval)
-        
-        return intervals
+        return self._calculate_posting_intervals(self._prepare(posts)['dates'])
     
-    def _calculate_text_complexity(self, text: str) -> float:
+    def _calculate_text_complexity(self, texts: List[str]) -> float:
         """Calculate text complexity score"""
-        if not text:
-            return 0
-        
-        sentences = len(re.findall(r'[.!?]+', text))
-        words = len(text.split())
-        
-        if sentences == 0:
+        # Counts add up across posts, so there is no need to join them into one string
+        sentences = 0
+        word_count = 0
+        char_count = 0
+        for text in texts:
+            words = text.split()
+            sentences += len(_SENT_RE.findall(text))
+            word_count += len(words)
+            char_count += sum(map(len, words))
+        
+        if sentences == 0 or word_count == 0:
             return 0
         
-        avg_sentence_length = words / sentences
-        avg_word_length = sum(len(word) for word in text.split()) / max(1, words)
-        
-        # Simple complexity score
-        complexity = (avg_sentence_length * avg_word_length) / 100
-        return min(1, complexity)
\ No newline at end of file
+        # Simple complexity score: average sentence length times average word length,
+        # where the word counts cancel out
+        complexity = char_count / sentences / 100
+        return min(1, complexity)
+
+
+# Analyzer owned by a pool worker process, built on its first task
+_worker_analyzer = None
+
+
+def _run_analysis(method: str, argument: Any) -> Dict[str, Any]:
+    """Run one AdvancedSocialAnalyzer method inside a pool worker"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = AdvancedSocialAnalyzer()
+    return getattr(_worker_analyzer, method)(argument)
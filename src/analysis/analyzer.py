@@ -1,18 +1,63 @@
+import os
 import re
 from collections import Counter
-from datetime import datetime
-from typing import Dict, List, Any, Tuple
-from textblob import TextBlob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from heapq import nlargest
+from typing import Dict, List, Any, Optional, Tuple
+import unicodedata
+from textblob.en import sentiment as pattern_sentiment
+import numpy as np
 import pandas as pd
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Words of four or more characters; shorter ones were never counted as keywords
+KEYWORD_RE = re.compile(r'\b\w{4,}\b')
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'})
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# One flat class, so a failing tail cannot backtrack through overlapping alternatives;
+# the $-_ range already covers digits, capitals, '%' and the usual URL punctuation
+URL_RE = re.compile(r'https?://[!$-_a-z]+')
+# URLs and phones in one alternation so each text is scanned once; URLs win so their digits
+# aren't phones. Emails are scanned on their own, since a URL match would swallow any inside it
+ENTITY_RE = re.compile('|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in (
+    ('urls', URL_RE), ('phones', PHONE_RE))))
+
+# Scripts that identify a language on their own (first word of the Unicode character name)
+SCRIPT_LANGUAGES = {
+    'HANGUL': 'ko', 'HIRAGANA': 'ja', 'KATAKANA': 'ja', 'CJK': 'zh', 'CYRILLIC': 'ru', 'ARABIC': 'ar',
+    'GREEK': 'el', 'HEBREW': 'he', 'THAI': 'th', 'DEVANAGARI': 'hi', 'BENGALI': 'bn', 'TAMIL': 'ta'
+}
+# Frequent function words for telling Latin-script languages apart
+LANGUAGE_STOP_WORDS = {
+    'en': frozenset({'the', 'and', 'is', 'are', 'was', 'you', 'this', 'that', 'with', 'for', 'have', 'not', 'my', 'of'}),
+    'es': frozenset({'el', 'los', 'las', 'y', 'es', 'que', 'por', 'con', 'una', 'para', 'pero', 'muy', 'del', 'mi'}),
+    'fr': frozenset({'le', 'les', 'et', 'est', 'une', 'que', 'pour', 'avec', 'dans', 'pas', 'sur', 'je', 'des', 'du'}),
+    'de': frozenset({'der', 'die', 'das', 'und', 'ist', 'nicht', 'mit', 'ich', 'ein', 'eine', 'auf', 'für', 'auch', 'zu'}),
+    'pt': frozenset({'o', 'os', 'e', 'é', 'que', 'não', 'com', 'uma', 'para', 'muito', 'mas', 'do', 'da', 'meu'}),
+    'it': frozenset({'il', 'gli', 'e', 'è', 'che', 'non', 'con', 'una', 'per', 'sono', 'ma', 'della', 'mio', 'di'})
+}
+LETTERS_RE = re.compile(r'[^\W\d_]+')
+# Below this many hashtags a plain Counter beats building a pandas Series
+HASHTAG_VALUE_COUNTS_MIN = 256
+# ASCII texts at least this long are counted with NumPy for readability; str.split wins below it
+READABILITY_NUMPY_MIN_CHARS = 1024
+# Which ASCII codes str.split() treats as whitespace
+ASCII_WHITESPACE = np.array([chr(code).isspace() for code in range(128)])
+# Smaller profiles run their sub-analyses inline; thread handoff would cost more than it saves
+PARALLEL_MIN_POSTS = 100
+
 class Analyzer:
     def __init__(self):
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
-        self.url_pattern = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+        self.email_pattern = EMAIL_RE
+        self.phone_pattern = PHONE_RE
+        self.url_pattern = URL_RE
+        self._entity_re = ENTITY_RE
+        # Parsed dates of the most recently analyzed posts list, see _post_datetimes()
+        self._parsed_dates = None
     
     def analyze_profile(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform comprehensive analysis on profile data"""
@@ -21,16 +66,29 @@ class Analyzer:
         
         logger.info(f"Analyzing profile with {len(posts)} posts")
         
+        # Post text resolved once, parallel to posts ('' when a post has none)
+        texts = [post.get('caption') or post.get('content') or '' for post in posts]
+        
         analysis = {
             'post_count': len(posts),
-            'profile_analysis': self._analyze_profile_info(profile),
-            'content_analysis': self._analyze_content(posts),
-            'sentiment_analysis': self._analyze_sentiment(posts),
-            'entity_extraction': self._extract_entities(posts),
-            'activity_analysis': self._analyze_activity_patterns(posts),
-            'hashtag_analysis': self._analyze_hashtags(posts),
-            'engagement_analysis': self._analyze_engagement(posts)
+            'profile_analysis': self._analyze_profile_info(profile)
+        }
+        
+        # Independent passes over the same posts; none of them modifies a post
+        tasks = {
+            'content_analysis': (self._analyze_content, texts),
+            'sentiment_analysis': (self._analyze_sentiment, posts, texts),
+            'entity_extraction': (self._extract_entities, posts, texts),
+            'activity_analysis': (self._analyze_activity_patterns, posts),
+            'hashtag_analysis': (self._analyze_hashtags, posts),
+            'engagement_analysis': (self._analyze_engagement, posts)
         }
+        if len(posts) < PARALLEL_MIN_POSTS:
+            analysis.update({name: task[0](*task[1:]) for name, task in tasks.items()})
+        else:
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = {name: executor.submit(*task) for name, task in tasks.items()}
+                analysis.update({name: future.result() for name, future in futures.items()})
         
         # Handle case when no posts available
         if len(posts) == 0:
@@ -39,11 +97,11 @@ class Analyzer:
             analysis['sentiment_analysis'] = self._analyze_profile_sentiment(profile)
         
         # Calculate overall sentiment score
-        sentiment_scores = [s['polarity'] for s in analysis['sentiment_analysis']]
-        analysis['sentiment_score'] = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
+        sentiment_scores = np.fromiter((s['polarity'] for s in analysis['sentiment_analysis']), dtype=np.float64)
+        analysis['sentiment_score'] = float(sentiment_scores.mean()) if sentiment_scores.size else 0
         
         # Get top keywords
-        analysis['top_keywords'] = self._get_top_keywords(posts)
+        analysis['top_keywords'] = self._get_top_keywords(texts)
         
         # Activity peak
         analysis['activity_peak'] = self._get_activity_peak(posts)
@@ -63,62 +121,55 @@ class Analyzer:
             'extracted_entities': self._extract_entities_from_text(bio_text)
         }
     
-    def _analyze_content(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_content(self, texts: List[str]) -> Dict[str, Any]:
         """Analyze post content"""
-        all_text = []
-        for post in posts:
-            text = post.get('caption', '') or post.get('content', '')
-            if text:
-                all_text.append(text)
+        all_text = [text for text in texts if text]
         
-        combined_text = ' '.join(all_text)
+        # Length of the space-joined captions, without building the joined string
+        total_characters = sum(map(len, all_text)) + max(0, len(all_text) - 1)
         
         return {
-            'total_characters': len(combined_text),
-            'avg_post_length': len(combined_text) / len(posts) if posts else 0,
+            'total_characters': total_characters,
+            'avg_post_length': total_characters / len(texts) if texts else 0,
             'language_detection': self._detect_languages(all_text),
-            'readability_score': self._calculate_readability(combined_text)
+            'readability_score': self._calculate_readability(all_text)
         }
     
-    def _analyze_sentiment(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _analyze_sentiment(self, posts: List[Dict[str, Any]], texts: List[str]) -> List[Dict[str, Any]]:
         """Analyze sentiment of posts"""
-        sentiments = []
-        
-        for post in posts:
-            text = post.get('caption', '') or post.get('content', '')
-            if text:
-                blob = TextBlob(text)
-                sentiments.append({
-                    'post_id': post.get('shortcode') or post.get('id'),
-                    'polarity': blob.sentiment.polarity,
-                    'subjectivity': blob.sentiment.subjectivity,
-                    'sentiment_label': self._get_sentiment_label(blob.sentiment.polarity)
-                })
-        
-        return sentiments
+        # Same scores as TextBlob(text).sentiment, without building a blob per post
+        scored = [(post, pattern_sentiment(text)) for post, text in zip(posts, texts) if text]
+        
+        # Same thresholds as _get_sentiment_label, applied to all posts at once
+        polarities = np.fromiter((score[0] for _, score in scored), dtype=np.float64, count=len(scored))
+        labels = np.select([polarities > 0.1, polarities < -0.1], ['positive', 'negative'], default='neutral')
+        
+        return [{
+            'post_id': post.get('shortcode') or post.get('id'),
+            'polarity': polarity,
+            'subjectivity': subjectivity,
+            'sentiment_label': label
+        } for (post, (polarity, subjectivity)), label in zip(scored, labels.tolist())]
     
-    def _extract_entities(self, posts: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    def _extract_entities(self, posts: List[Dict[str, Any]], texts: List[str]) -> Dict[str, List[str]]:
         """Extract entities from all posts"""
-        emails = set()
-        phones = set()
-        urls = set()
+        found = {'emails': set(), 'phones': set(), 'urls': set()}
         mentions = set()
         
-        for post in posts:
-            text = post.get('caption', '') or post.get('content', '')
+        for post, text in zip(posts, texts):
             if text:
-                emails.update(self.email_pattern.findall(text))
-                phones.update(self.phone_pattern.findall(text))
-                urls.update(self.url_pattern.findall(text))
+                found['emails'].update(self.email_pattern.findall(text))
+                for match in self._entity_re.finditer(text):
+                    found[match.lastgroup].add(match.group())
             
             # Add mentions from post metadata
             post_mentions = post.get('mentions', [])
             mentions.update(post_mentions)
         
         return {
-            'emails': list(emails),
-            'phones': list(phones),
-            'urls': list(urls),
+            'emails': list(found['emails']),
+            'phones': list(found['phones']),
+            'urls': list(found['urls']),
             'mentions': list(mentions)
         }
     
@@ -127,32 +178,21 @@ class Analyzer:
         if not posts:
             return {}
         
-        dates = []
-        hours = []
-        
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    dates.append(dt.date())
-                    hours.append(dt.hour)
-                except:
-                    continue
-        
-        if not dates:
+        datetimes = self._post_datetimes(posts)
+        if datetimes.empty:
             return {}
+        dates = datetimes.date.tolist()
         
         # Activity by hour
-        hour_counts = Counter(hours)
-        most_active_hour = hour_counts.most_common(1)[0][0] if hour_counts else None
+        hour_counts = np.bincount(datetimes.hour, minlength=24)
+        most_active_hour = int(hour_counts.argmax())
         
         # Activity by day
         date_counts = Counter(dates)
         
         return {
             'most_active_hour': most_active_hour,
-            'posts_by_hour': dict(hour_counts),
+            'posts_by_hour': {hour: int(hour_counts[hour]) for hour in range(24) if hour_counts[hour]},
             'posts_by_date': {str(k): v for k, v in date_counts.items()},
             'posting_frequency': len(dates) / max(1, (max(dates) - min(dates)).days) if len(dates) > 1 else 0
         }
@@ -165,39 +205,44 @@ class Analyzer:
             hashtags = post.get('hashtags', [])
             all_hashtags.extend([tag.lower() for tag in hashtags])
         
-        hashtag_counts = Counter(all_hashtags)
+        if len(all_hashtags) < HASHTAG_VALUE_COUNTS_MIN:
+            hashtag_counts = Counter(all_hashtags)
+            top_hashtags = hashtag_counts.most_common(10)
+        else:
+            # Unsorted counts keep first-seen order, so nlargest breaks ties like most_common
+            hashtag_counts = pd.Series(all_hashtags, dtype=object).value_counts(sort=False)
+            top_hashtags = [(tag, int(count)) for tag, count in hashtag_counts.nlargest(10).items()]
         
         return {
             'total_hashtags': len(all_hashtags),
             'unique_hashtags': len(hashtag_counts),
-            'top_hashtags': hashtag_counts.most_common(10),
+            'top_hashtags': top_hashtags,
             'hashtag_diversity': len(hashtag_counts) / max(1, len(all_hashtags))
         }
     
     def _analyze_engagement(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze engagement metrics"""
-        likes = []
-        comments = []
-        
-        for post in posts:
-            likes.append(post.get('likes', 0) or post.get('like_count', 0))
-            comments.append(post.get('comments', 0) or post.get('reply_count', 0))
+        likes = np.fromiter((post.get('likes') or post.get('like_count') or 0 for post in posts),
+                            dtype=np.int64, count=len(posts))
+        comments = np.fromiter((post.get('comments') or post.get('reply_count') or 0 for post in posts),
+                               dtype=np.int64, count=len(posts))
+        total_likes = int(likes.sum())
+        total_comments = int(comments.sum())
         
         return {
-            'avg_likes': sum(likes) / len(likes) if likes else 0,
-            'avg_comments': sum(comments) / len(comments) if comments else 0,
-            'total_likes': sum(likes),
-            'total_comments': sum(comments),
-            'engagement_rate': (sum(likes) + sum(comments)) / len(posts) if posts else 0
+            'avg_likes': float(likes.mean()) if posts else 0,
+            'avg_comments': float(comments.mean()) if posts else 0,
+            'total_likes': total_likes,
+            'total_comments': total_comments,
+            'engagement_rate': (total_likes + total_comments) / len(posts) if posts else 0
         }
     
     def _extract_entities_from_text(self, text: str) -> Dict[str, List[str]]:
         """Extract entities from a single text"""
-        return {
-            'emails': self.email_pattern.findall(text),
-            'phones': self.phone_pattern.findall(text),
-            'urls': self.url_pattern.findall(text)
-        }
+        entities = {'emails': self.email_pattern.findall(text), 'phones': [], 'urls': []}
+        for match in self._entity_re.finditer(text):
+            entities[match.lastgroup].append(match.group())
+        return entities
     
     def _calculate_follower_ratio(self, profile: Dict[str, Any]) -> float:
         """Calculate follower to following ratio"""
@@ -208,31 +253,69 @@ class Analyzer:
     
     def _detect_languages(self, texts: List[str]) -> Dict[str, int]:
         """Detect languages in texts"""
-        languages = []
-        for text in texts:
-            try:
-                blob = TextBlob(text)
-                lang = blob.detect_language()
-                languages.append(lang)
-            except:
-                continue
-        
-        return dict(Counter(languages))
+        # Detected offline; TextBlob's detect_language made a web request per text
+        languages = (self._detect_language(text) for text in texts)
+        return dict(Counter(language for language in languages if language))
+    
+    def _detect_language(self, text: str) -> Optional[str]:
+        """Guess a text's ISO 639-1 language from its script or common words, None if unsure"""
+        if not text.isascii():
+            scripts = Counter(unicodedata.name(char, 'UNKNOWN').split()[0] for char in text if char.isalpha())
+            for script, _ in scripts.most_common():
+                if script in SCRIPT_LANGUAGES:
+                    # Kanji alongside kana is Japanese rather than Chinese
+                    if script == 'CJK' and (scripts['HIRAGANA'] or scripts['KATAKANA']):
+                        return 'ja'
+                    return SCRIPT_LANGUAGES[script]
+                if script == 'LATIN':
+                    break
+        
+        words = LETTERS_RE.findall(text.lower())
+        scores = {language: sum(word in stop_words for word in words)
+                  for language, stop_words in LANGUAGE_STOP_WORDS.items()}
+        language = max(scores, key=scores.get)
+        return language if scores[language] else None
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, texts: List[str]) -> float:
         """Simple readability score based on sentence and word length"""
-        if not text:
+        if not texts:
             return 0
         
-        sentences = text.split('.')
-        words = text.split()
-        
-        avg_sentence_length = len(words) / max(1, len(sentences))
-        avg_word_length = sum(len(word) for word in words) / max(1, len(words))
+        # Totals over all texts, counted as if they were joined with spaces
+        sentence_count = 1
+        word_count = 0
+        char_count = 0
+        for text in texts:
+            sentence_count += text.count('.')
+            if len(text) >= READABILITY_NUMPY_MIN_CHARS and text.isascii():
+                # One vectorized pass: words start where non-space follows space
+                non_space = ~ASCII_WHITESPACE[np.frombuffer(text.encode('ascii'), dtype=np.uint8)]
+                word_count += int(non_space[0]) + int(np.count_nonzero(non_space[1:] > non_space[:-1]))
+                char_count += int(np.count_nonzero(non_space))
+            else:
+                words = text.split()
+                word_count += len(words)
+                char_count += sum(map(len, words))
+        
+        avg_sentence_length = word_count / sentence_count
+        avg_word_length = char_count / max(1, word_count)
         
         # Simple readability score (lower is easier)
         return avg_sentence_length * avg_word_length / 100
     
+    def _post_datetimes(self, posts: List[Dict[str, Any]]) -> pd.DatetimeIndex:
+        """Post dates parsed in one batch as UTC, in post order, skipping missing or invalid ones"""
+        # The activity analysis and activity peak of one profile share a single parse
+        cached = self._parsed_dates
+        if cached is not None and cached[0] is posts and cached[1] == len(posts):
+            return cached[2]
+        
+        parsed = pd.to_datetime(pd.Series([post.get('date') for post in posts], dtype=object),
+                                utc=True, format='ISO8601', errors='coerce')
+        datetimes = pd.DatetimeIndex(parsed.dropna())
+        self._parsed_dates = (posts, len(posts), datetimes)
+        return datetimes
+    
     def _get_sentiment_label(self, polarity: float) -> str:
         """Convert polarity to sentiment label"""
         if polarity > 0.1:
@@ -242,42 +325,24 @@ class Analyzer:
         else:
             return 'neutral'
     
-    def _get_top_keywords(self, posts: List[Dict[str, Any]]) -> List[str]:
+    def _get_top_keywords(self, texts: List[str]) -> List[str]:
         """Extract top keywords from posts"""
-        all_text = []
-        for post in posts:
-            text = post.get('caption', '') or post.get('content', '')
+        word_counts = Counter()
+        for text in texts:
             if text:
-                all_text.append(text)
-        
-        combined_text = ' '.join(all_text).lower()
-        words = re.findall(r'\b\w+\b', combined_text)
-        
-        # Filter out common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-        
-        filtered_words = [word for word in words if len(word) > 3 and word not in stop_words]
-        word_counts = Counter(filtered_words)
+                # Filter out common words
+                word_counts.update(word for word in KEYWORD_RE.findall(text.lower()) if word not in STOP_WORDS)
         
-        return [word for word, count in word_counts.most_common(10)]
+        # Only the words are needed, so rank the keys directly instead of (word, count) pairs
+        return nlargest(10, word_counts, key=word_counts.__getitem__)
     
     def _get_activity_peak(self, posts: List[Dict[str, Any]]) -> str:
         """Get peak activity time"""
-        hours = []
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    hours.append(dt.hour)
-                except:
-                    continue
-        
-        if not hours:
+        datetimes = self._post_datetimes(posts)
+        if datetimes.empty:
             return 'Unknown'
         
-        hour_counts = Counter(hours)
-        peak_hour = hour_counts.most_common(1)[0][0]
+        peak_hour = int(np.bincount(datetimes.hour, minlength=24).argmax())
         
         if 6 <= peak_hour < 12:
             return 'Morning'
@@ -286,4 +351,32 @@ class Analyzer:
         elif 18 <= peak_hour < 24:
             return 'Evening'
         else:
-            return 'Night'
\ No newline at end of file
+            return 'Night'
+
+
+_shared_analyzer: Optional[Analyzer] = None
+
+
+def get_analyzer() -> Analyzer:
+    """Process-wide Analyzer, built on first use"""
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        _shared_analyzer = Analyzer()
+    return _shared_analyzer
+
+
+def _analyze_profile_worker(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pool entry point; each worker process keeps its own shared Analyzer"""
+    return get_analyzer().analyze_profile(data)
+
+
+def analyze_profiles_batch(profiles: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Analyze many profiles across worker processes, returning results in input order"""
+    workers = min(workers or os.cpu_count() or 1, len(profiles))
+    if workers <= 1:
+        return [get_analyzer().analyze_profile(data) for data in profiles]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Hand out several profiles per task so pickling overhead is amortized
+        chunksize = max(1, len(profiles) // (workers * 4))
+        return list(executor.map(_analyze_profile_worker, profiles, chunksize=chunksize))
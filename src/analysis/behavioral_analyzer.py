@@ -1,12 +1,62 @@
 import re
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
 import random
+import numpy as np
+import pandas as pd
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+
+@dataclass
+class PostsView:
+    """Per-field columns of a post list, gathered in a single pass"""
+    count: int
+    captions: List[str]
+    captions_lower: List[str]
+    hashtags_flat: List[str]
+    mentions_flat: List[str]
+    times: pd.DatetimeIndex
+    likes: np.ndarray
+    comments: np.ndarray
+    is_video: np.ndarray
+    
+    @classmethod
+    def from_posts(cls, posts: List[Dict[str, Any]]) -> 'PostsView':
+        """Build the columns from raw post dicts"""
+        count = len(posts)
+        captions, dates, hashtags_flat, mentions_flat = [], [], [], []
+        likes = np.zeros(count, dtype=np.float64)
+        comments = np.zeros(count, dtype=np.float64)
+        is_video = np.zeros(count, dtype=bool)
+        for i, post in enumerate(posts):
+            captions.append(post.get('caption') or '')
+            dates.append(post.get('date'))
+            hashtags_flat.extend(post.get('hashtags', []))
+            mentions_flat.extend(post.get('mentions', []))
+            likes[i] = post.get('likes') or 0
+            comments[i] = post.get('comments') or 0
+            is_video[i] = bool(post.get('is_video', False))
+        
+        # Posting times, parsed in one batch; unparseable dates are dropped
+        parsed = pd.to_datetime(pd.Series(dates, dtype=object), utc=True, format='ISO8601', errors='coerce')
+        
+        return cls(
+            count=count,
+            captions=captions,
+            captions_lower=[caption.lower() for caption in captions],
+            hashtags_flat=hashtags_flat,
+            mentions_flat=mentions_flat,
+            times=pd.DatetimeIndex(parsed.dropna()),
+            likes=likes,
+            comments=comments,
+            is_video=is_video
+        )
+
+
 class BehavioralAnalyzer:
     def __init__(self):
         self.personality_indicators = {
@@ -16,24 +66,32 @@ class BehavioralAnalyzer:
             'analytical': ['data', 'analysis', 'logic', 'research', 'study', 'facts'],
             'emotional': ['feel', 'heart', 'love', 'sad', 'happy', 'emotional']
         }
+        self.aggressive_keywords = ['hate', 'kill', 'destroy', 'attack', 'violence', 'war']
+        self.promo_keywords = ['buy', 'sale', 'discount', 'offer', 'click link', 'dm me']
+        
+        keywords = {keyword for group in self.personality_indicators.values() for keyword in group}
+        keywords.update(self.aggressive_keywords, self.promo_keywords)
+        self._keywords = tuple(sorted(keywords))
     
     def analyze_behavior(self, profile_data: Dict[str, Any], posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Comprehensive behavioral analysis"""
+        view = PostsView.from_posts(posts)
+        keyword_counts = self._count_keywords(view)
         
         # Personality analysis
-        personality = self._analyze_personality(posts)
+        personality = self._analyze_personality(keyword_counts)
         
         # Activity patterns
-        activity_patterns = self._analyze_activity_patterns(posts)
+        activity_patterns = self._analyze_activity_patterns(view)
         
         # Content patterns
-        content_patterns = self._analyze_content_patterns(posts)
+        content_patterns = self._analyze_content_patterns(view)
         
         # Social behavior
-        social_behavior = self._analyze_social_behavior(posts, profile_data)
+        social_behavior = self._analyze_social_behavior(view, profile_data)
         
         # Risk assessment
-        risk_assessment = self._assess_behavioral_risks(posts, profile_data)
+        risk_assessment = self._assess_behavioral_risks(view, profile_data, keyword_counts)
         
         return {
             'personality_profile': personality,
@@ -44,13 +102,17 @@ class BehavioralAnalyzer:
             'behavioral_score': self._calculate_behavioral_score(personality, activity_patterns, social_behavior)
         }
     
-    def _analyze_personality(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _count_keywords(self, view: PostsView) -> Counter:
+        """Count personality, aggressive and promotional keywords across all captions"""
+        # str.count runs in C; no keyword contains NUL, so no match can span two captions
+        text = '\0'.join(view.captions_lower)
+        return Counter({keyword: text.count(keyword) for keyword in self._keywords})
+    
+    def _analyze_personality(self, keyword_counts: Counter) -> Dict[str, Any]:
         """Analyze personality traits from content"""
-        all_text = ' '.join([post.get('caption', '') for post in posts]).lower()
-        
         personality_scores = {}
         for trait, keywords in self.personality_indicators.items():
-            score = sum(all_text.count(keyword) for keyword in keywords)
+            score = sum(keyword_counts[keyword] for keyword in keywords)
             personality_scores[trait] = min(100, score * 10)  # Normalize to 0-100
         
         # Determine dominant trait
@@ -62,84 +124,71 @@ class BehavioralAnalyzer:
             'confidence': personality_scores.get(dominant_trait, 0)
         }
     
-    def _analyze_activity_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_activity_patterns(self, view: PostsView) -> Dict[str, Any]:
         """Analyze posting activity patterns"""
-        if not posts:
+        if not view.count:
             return {'pattern': 'no_activity', 'regularity': 0}
         
-        # Extract posting times
-        post_times = []
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    post_times.append(dt)
-                except:
-                    continue
-        
-        if not post_times:
+        post_times = view.times
+        
+        if post_times.empty:
             return {'pattern': 'unknown', 'regularity': 0}
         
         # Analyze patterns
-        hours = [dt.hour for dt in post_times]
-        days = [dt.weekday() for dt in post_times]
+        hour_counts = np.bincount(post_times.hour, minlength=24)
+        day_counts = np.bincount(post_times.weekday, minlength=7)
         
-        hour_distribution = Counter(hours)
-        day_distribution = Counter(days)
+        hour_distribution = {hour: int(hour_counts[hour]) for hour in range(24) if hour_counts[hour]}
+        day_distribution = {day: int(day_counts[day]) for day in range(7) if day_counts[day]}
         
         # Determine activity pattern
-        peak_hour = hour_distribution.most_common(1)[0][0] if hour_distribution else 12
-        peak_day = day_distribution.most_common(1)[0][0] if day_distribution else 0
+        peak_hour = int(hour_counts.argmax())
+        peak_day = int(day_counts.argmax())
         
         # Calculate regularity (how consistent posting times are)
         if len(post_times) > 1:
-            intervals = [(post_times[i] - post_times[i-1]).total_seconds() / 3600 
-                        for i in range(1, len(post_times))]
-            regularity = 100 - min(100, (max(intervals) - min(intervals)) / 24 * 100) if intervals else 0
+            # Hours between consecutive posts in chronological order
+            intervals = np.diff(np.sort(post_times.values)) / np.timedelta64(1, 'h')
+            regularity = 100 - min(100, float(intervals.max() - intervals.min()) / 24 * 100)
         else:
             regularity = 0
         
         return {
             'peak_hour': peak_hour,
             'peak_day': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'][peak_day],
-            'hour_distribution': dict(hour_distribution),
-            'day_distribution': dict(day_distribution),
+            'hour_distribution': hour_distribution,
+            'day_distribution': day_distribution,
             'regularity': regularity,
-            'posting_frequency': len(posts) / max(1, (max(post_times) - min(post_times)).days) if len(post_times) > 1 else 0
+            'posting_frequency': view.count / max(1, (max(post_times) - min(post_times)).days) if len(post_times) > 1 else 0
         }
     
-    def _analyze_content_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_content_patterns(self, view: PostsView) -> Dict[str, Any]:
         """Analyze content posting patterns"""
-        if not posts:
+        if not view.count:
             return {}
         
         # Content types
-        video_count = sum(1 for post in posts if post.get('is_video', False))
-        photo_count = len(posts) - video_count
+        video_count = int(view.is_video.sum())
+        photo_count = view.count - video_count
         
         # Caption analysis
-        caption_lengths = [len(post.get('caption', '')) for post in posts]
-        avg_caption_length = sum(caption_lengths) / len(caption_lengths) if caption_lengths else 0
+        caption_lengths = [len(caption) for caption in view.captions]
+        avg_caption_length = sum(caption_lengths) / len(caption_lengths)
         
         # Hashtag usage
-        all_hashtags = []
-        for post in posts:
-            hashtags = post.get('hashtags', [])
-            all_hashtags.extend(hashtags)
-        
-        hashtag_frequency = len(all_hashtags) / len(posts) if posts else 0
+        all_hashtags = view.hashtags_flat
+        hashtag_frequency = len(all_hashtags) / view.count
         
         return {
             'content_types': {
                 'photos': photo_count,
                 'videos': video_count,
-                'photo_percentage': (photo_count / len(posts)) * 100 if posts else 0
+                'photo_percentage': (photo_count / view.count) * 100
             },
             'caption_analysis': {
                 'avg_length': avg_caption_length,
-                'max_length': max(caption_lengths) if caption_lengths else 0,
-                'min_length': min(caption_lengths) if caption_lengths else 0
+                'max_length': max(caption_lengths),
+                'min_length': min(caption_lengths)
             },
             'hashtag_usage': {
                 'avg_per_post': hashtag_frequency,
@@ -148,15 +197,12 @@ class BehavioralAnalyzer:
             }
         }
     
-    def _analyze_social_behavior(self, posts: List[Dict[str, Any]], profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_social_behavior(self, view: PostsView, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze social interaction patterns"""
         
         # Engagement analysis
-        likes = [post.get('likes', 0) for post in posts]
-        comments = [post.get('comments', 0) for post in posts]
-        
-        avg_likes = sum(likes) / len(likes) if likes else 0
-        avg_comments = sum(comments) / len(comments) if comments else 0
+        avg_likes = float(view.likes.mean()) if view.count else 0
+        avg_comments = float(view.comments.mean()) if view.count else 0
         
         # Social connectivity
         followers = profile_data.get('followers', 0)
@@ -165,9 +211,7 @@ class BehavioralAnalyzer:
         social_ratio = followers / max(1, following)
         
         # Interaction style
-        mentions = []
-        for post in posts:
-            mentions.extend(post.get('mentions', []))
+        mentions = view.mentions_flat
         
         return {
             'engagement_metrics': {
@@ -182,34 +226,31 @@ class BehavioralAnalyzer:
                 'connectivity_level': 'High' if social_ratio > 10 else 'Medium' if social_ratio > 1 else 'Low'
             },
             'interaction_style': {
-                'mentions_per_post': len(mentions) / len(posts) if posts else 0,
+                'mentions_per_post': len(mentions) / view.count if view.count else 0,
                 'unique_mentions': len(set(mentions)),
-                'social_activity': 'Active' if len(mentions) > len(posts) * 0.5 else 'Moderate'
+                'social_activity': 'Active' if len(mentions) > view.count * 0.5 else 'Moderate'
             }
         }
     
-    def _assess_behavioral_risks(self, posts: List[Dict[str, Any]], profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_behavioral_risks(self, view: PostsView, profile_data: Dict[str, Any],
+                                 keyword_counts: Counter) -> Dict[str, Any]:
         """Assess potential behavioral risks"""
         risk_score = 0
         risk_factors = []
         
         # Check for aggressive language
-        aggressive_keywords = ['hate', 'kill', 'destroy', 'attack', 'violence', 'war']
-        all_text = ' '.join([post.get('caption', '') for post in posts]).lower()
-        
-        for keyword in aggressive_keywords:
-            if keyword in all_text:
+        for keyword in self.aggressive_keywords:
+            if keyword_counts[keyword]:
                 risk_score += 10
                 risk_factors.append(f'Aggressive language detected: {keyword}')
         
         # Check posting frequency (spam behavior)
-        if len(posts) > 50:  # More than 50 posts in dataset
+        if view.count > 50:  # More than 50 posts in dataset
             risk_score += 5
             risk_factors.append('High posting frequency')
         
         # Check for promotional content
-        promo_keywords = ['buy', 'sale', 'discount', 'offer', 'click link', 'dm me']
-        promo_count = sum(1 for keyword in promo_keywords if keyword in all_text)
+        promo_count = sum(1 for keyword in self.promo_keywords if keyword_counts[keyword])
         
         if promo_count > 3:
             risk_score += 15
@@ -258,4 +299,15 @@ class BehavioralAnalyzer:
             'Medium': 'Monitor account activity, some concerning patterns detected',
             'High': 'High risk account - recommend detailed investigation'
         }
-        return recommendations.get(risk_level, 'Unknown risk level')
\ No newline at end of file
+        return recommendations.get(risk_level, 'Unknown risk level')
+
+
+_shared_behavioral_analyzer: Optional[BehavioralAnalyzer] = None
+
+
+def get_behavioral_analyzer() -> BehavioralAnalyzer:
+    """Process-wide BehavioralAnalyzer, built on first use"""
+    global _shared_behavioral_analyzer
+    if _shared_behavioral_analyzer is None:
+        _shared_behavioral_analyzer = BehavioralAnalyzer()
+    return _shared_behavioral_analyzer
@@ -1,75 +1,188 @@
 import re
 import numpy as np
+import pandas as pd
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from textblob import TextBlob
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-import hashlib
-from typing import Dict, List, Any, Tuple
+import functools
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Code point ranges counted as emoji by the communication style analysis
+_EMOJI_RANGES = ((0x1F600, 0x1F64F), (0x1F300, 0x1F5FF), (0x1F680, 0x1F6FF), (0x1F1E0, 0x1F1FF))
+_WORD_CHAR_RE = re.compile(r'\w')
+# Which ASCII codes the re module treats as word characters, for \b checks on code point arrays
+_ASCII_WORD_CHARS = np.array([bool(_WORD_CHAR_RE.match(chr(code))) for code in range(128)])
+
+# Smaller profiles run their analyses inline; thread handoff would cost more than it saves
+_PARALLEL_MIN_POSTS = 100
+
+# Entropy of a uniform spread over every hour / weekday, the least routine case
+_MAX_HOUR_ENTROPY = np.log2(24)
+_MAX_DAY_ENTROPY = np.log2(7)
+
+# NumPy 2 counts set bits with the CPU popcount instruction; older releases unpack the bits instead
+_BITWISE_COUNT = getattr(np, 'bitwise_count', None)
+
+# Content kinds counted towards profile completeness, as bits of one mask
+_CONTENT_VIDEO = 1
+_CONTENT_TEXT = 2
+_CONTENT_IMAGE = 4
+
+# Keyword tables, built once at import and shared by every profiler
+PERSONALITY_INDICATORS = {
+    'extroversion': {
+        'high': frozenset({'party', 'social', 'friends', 'crowd', 'event', 'meeting', 'gathering'}),
+        'low': frozenset({'alone', 'quiet', 'solitude', 'private', 'introvert', 'home'})
+    },
+    'neuroticism': {
+        'high': frozenset({'stress', 'worry', 'anxiety', 'nervous', 'upset', 'sad', 'depressed'}),
+        'low': frozenset({'calm', 'relaxed', 'peaceful', 'stable', 'confident', 'secure'})
+    },
+    'openness': {
+        'high': frozenset({'art', 'creative', 'new', 'explore', 'adventure', 'culture', 'innovative'}),
+        'low': frozenset({'traditional', 'conventional', 'routine', 'familiar', 'conservative'})
+    },
+    'conscientiousness': {
+        'high': frozenset({'plan', 'organize', 'schedule', 'goal', 'achieve', 'work', 'discipline'}),
+        'low': frozenset({'spontaneous', 'flexible', 'casual', 'relaxed', 'unplanned'})
+    },
+    'agreeableness': {
+        'high': frozenset({'help', 'kind', 'support', 'care', 'love', 'family', 'compassion'}),
+        'low': frozenset({'compete', 'argue', 'disagree', 'conflict', 'challenge', 'critical'})
+    }
+}
+
+LIFESTYLE_INDICATORS = {
+    'health_conscious': frozenset({'gym', 'workout', 'healthy', 'fitness', 'exercise', 'nutrition'}),
+    'tech_savvy': frozenset({'tech', 'coding', 'programming', 'software', 'digital', 'app'}),
+    'travel_enthusiast': frozenset({'travel', 'trip', 'vacation', 'explore', 'adventure', 'journey'}),
+    'foodie': frozenset({'food', 'restaurant', 'cooking', 'recipe', 'cuisine', 'delicious'}),
+    'career_focused': frozenset({'work', 'career', 'professional', 'business', 'success', 'achievement'}),
+    'family_oriented': frozenset({'family', 'kids', 'children', 'parents', 'home', 'together'})
+}
+
+EMOTION_KEYWORDS = {
+    'joy': frozenset({'happy', 'joy', 'excited', 'amazing', 'wonderful', 'great'}),
+    'sadness': frozenset({'sad', 'depressed', 'down', 'upset', 'disappointed'}),
+    'anger': frozenset({'angry', 'mad', 'furious', 'annoyed', 'frustrated'}),
+    'fear': frozenset({'scared', 'afraid', 'worried', 'anxious', 'nervous'}),
+    'surprise': frozenset({'surprised', 'shocked', 'amazed', 'unexpected'})
+}
+
+INFLUENCE_KEYWORDS = {
+    'authority': frozenset({'expert', 'professional', 'certified', 'qualified', 'experienced'}),
+    'social_proof': frozenset({'everyone', 'popular', 'trending', 'viral', 'thousands'}),
+    'reciprocity': frozenset({'free', 'gift', 'bonus', 'exclusive', 'special offer'}),
+    'commitment': frozenset({'promise', 'guarantee', 'commit', 'pledge', 'assure'}),
+    'liking': frozenset({'like me', 'similar', 'understand', 'relate', 'connect'}),
+    'scarcity': frozenset({'limited', 'rare', 'exclusive', 'only', 'last chance'})
+}
+
+RISK_KEYWORDS = {
+    'impulsivity': frozenset({'impulse', 'sudden', 'immediately', 'right now', 'can\'t wait'}),
+    'aggression': frozenset({'angry', 'hate', 'fight', 'destroy', 'kill', 'attack'}),
+    'isolation': frozenset({'alone', 'nobody', 'isolated', 'lonely', 'abandoned'}),
+    'instability': frozenset({'chaos', 'unstable', 'crazy', 'insane', 'losing it'})
+}
+
+FORMAL_WORDS = frozenset({'therefore', 'however', 'furthermore', 'consequently', 'nevertheless'})
+INFORMAL_WORDS = frozenset({'lol', 'omg', 'btw', 'tbh', 'imo', 'gonna', 'wanna'})
+
+# Words that make recent posts count towards a risk escalation prediction
+ESCALATION_KEYWORDS = frozenset({'angry', 'hate', 'violence', 'threat', 'harm'})
+# Scans a text once for all of them; the lookahead lets matches overlap
+_ESCALATION_RE = re.compile('(?=(' + '|'.join(sorted(ESCALATION_KEYWORDS)) + '))')
+
+# Persuasion style named after the strongest influence technique
+PERSUASION_STYLES = {
+    'authority': 'expert_based',
+    'social_proof': 'popularity_based',
+    'reciprocity': 'give_and_take',
+    'commitment': 'promise_based',
+    'liking': 'relationship_based',
+    'scarcity': 'urgency_based'
+}
+
+# Key picking the score out of (name, score) items
+_BY_SCORE = itemgetter(1)
+
+# Posts per hashtag window compared by topic-shift detection
+_TOPIC_WINDOW_SIZE = 3
+
+# Largest posts x vocabulary hashtag bitset kept in memory (16M bits, 2 MB); wider
+# vocabularies fall back to hashtag counters
+_MAX_HASHTAG_BITS = 1 << 24
+
 class BehavioralProfiler:
     def __init__(self):
-        self.personality_indicators = {
-            'extroversion': {
-                'high': ['party', 'social', 'friends', 'crowd', 'event', 'meeting', 'gathering'],
-                'low': ['alone', 'quiet', 'solitude', 'private', 'introvert', 'home']
-            },
-            'neuroticism': {
-                'high': ['stress', 'worry', 'anxiety', 'nervous', 'upset', 'sad', 'depressed'],
-                'low': ['calm', 'relaxed', 'peaceful', 'stable', 'confident', 'secure']
-            },
-            'openness': {
-                'high': ['art', 'creative', 'new', 'explore', 'adventure', 'culture', 'innovative'],
-                'low': ['traditional', 'conventional', 'routine', 'familiar', 'conservative']
-            },
-            'conscientiousness': {
-                'high': ['plan', 'organize', 'schedule', 'goal', 'achieve', 'work', 'discipline'],
-                'low': ['spontaneous', 'flexible', 'casual', 'relaxed', 'unplanned']
-            },
-            'agreeableness': {
-                'high': ['help', 'kind', 'support', 'care', 'love', 'family', 'compassion'],
-                'low': ['compete', 'argue', 'disagree', 'conflict', 'challenge', 'critical']
-            }
-        }
-        
-        self.lifestyle_indicators = {
-            'health_conscious': ['gym', 'workout', 'healthy', 'fitness', 'exercise', 'nutrition'],
-            'tech_savvy': ['tech', 'coding', 'programming', 'software', 'digital', 'app'],
-            'travel_enthusiast': ['travel', 'trip', 'vacation', 'explore', 'adventure', 'journey'],
-            'foodie': ['food', 'restaurant', 'cooking', 'recipe', 'cuisine', 'delicious'],
-            'career_focused': ['work', 'career', 'professional', 'business', 'success', 'achievement'],
-            'family_oriented': ['family', 'kids', 'children', 'parents', 'home', 'together']
-        }
-        
+        self.personality_indicators = PERSONALITY_INDICATORS
+        self.lifestyle_indicators = LIFESTYLE_INDICATORS
+        self.emotion_keywords = EMOTION_KEYWORDS
+        self.influence_keywords = INFLUENCE_KEYWORDS
+        self.risk_keywords = RISK_KEYWORDS
+        
+        self._keyword_re, self._keyword_prefixes = self._keyword_matcher()
+        # Profile, anomaly and trend passes score the same posts, and reposts repeat text
+        self._polarity = functools.lru_cache(maxsize=4096)(self._score_polarity)
+        # Per-post fields of the most recently analyzed posts list, see _prepare()
+        self._prepared = None
+        
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _keyword_matcher(cls) -> Tuple[re.Pattern, Dict[str, List[str]]]:
+        """Keyword pattern and prefix table, compiled once and shared by every profiler"""
+        # Every keyword of every table in one pattern so each text is scanned once;
+        # the lookahead lets matches overlap
+        keywords = {keyword for indicators in PERSONALITY_INDICATORS.values()
+                    for group in indicators.values() for keyword in group}
+        for table in (LIFESTYLE_INDICATORS, EMOTION_KEYWORDS, INFLUENCE_KEYWORDS, RISK_KEYWORDS):
+            keywords.update(keyword for group in table.values() for keyword in group)
+        keywords.update(FORMAL_WORDS, INFORMAL_WORDS)
+        keyword_re = re.compile('(?=(' + '|'.join(
+            re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)) + '))')
+        # A match is the longest keyword at its position; shorter keywords it starts with match there too
+        keyword_prefixes = {keyword: [prefix for prefix in keywords if keyword.startswith(prefix)]
+                            for keyword in keywords}
+        return keyword_re, keyword_prefixes
+    
     def create_comprehensive_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create comprehensive behavioral profile"""
         posts = profile_data.get('posts', [])
         profile = profile_data.get('profile', {})
         
-        # Personality analysis
-        personality_traits = self._analyze_personality_traits(posts)
-        
-        # Lifestyle analysis
-        lifestyle_profile = self._analyze_lifestyle_patterns(posts)
-        
-        # Communication style
-        communication_style = self._analyze_communication_style(posts)
-        
-        # Emotional patterns
-        emotional_profile = self._analyze_emotional_patterns(posts)
-        
-        # Social behavior
-        social_behavior = self._analyze_social_behavior(posts, profile)
-        
-        # Routine analysis
-        routine_patterns = self._analyze_routine_patterns(posts)
-        
-        # Risk assessment
-        risk_profile = self._assess_behavioral_risks(posts)
+        if not posts:
+            return self._empty_profile(profile)
+        
+        # Shared per-post data is built once up front so the analyses below only read it
+        self._scan_all(posts)
+        
+        tasks = {
+            'personality': (self._analyze_personality_traits, posts),
+            'lifestyle': (self._analyze_lifestyle_patterns, posts),
+            'communication': (self._analyze_communication_style, posts),
+            'emotional': (self._analyze_emotional_patterns, posts),
+            'social': (self._analyze_social_behavior, posts, profile),
+            'routine': (self._analyze_routine_patterns, posts),
+            'risk': (self._assess_behavioral_risks, posts)
+        }
+        if len(posts) < _PARALLEL_MIN_POSTS:
+            results = {name: task[0](*task[1:]) for name, task in tasks.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {name: executor.submit(*task) for name, task in tasks.items()}
+                results = {name: future.result() for name, future in futures.items()}
+        
+        personality_traits = results['personality']
+        lifestyle_profile = results['lifestyle']
+        communication_style = results['communication']
+        emotional_profile = results['emotional']
+        social_behavior = results['social']
+        routine_patterns = results['routine']
+        risk_profile = results['risk']
         
         # Generate insights
         behavioral_insights = self._generate_behavioral_insights(
@@ -89,19 +202,46 @@ class BehavioralProfiler:
             'profile_completeness': self._calculate_profile_completeness(posts, profile)
         }
     
-    def predict_future_behavior(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Predict future behavior based on historical patterns"""
+    def _empty_profile(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Profile of an account without posts, skipping the keyword and text analyses"""
+        risk_indicators = {risk_type: 0.0 for risk_type in self.risk_keywords}
+        personality_traits = {trait: 0.0 for trait in self.personality_indicators}
+        lifestyle_profile = {lifestyle: 0.0 for lifestyle in self.lifestyle_indicators}
+        social_behavior = self._analyze_social_behavior([], profile)
+        
+        return {
+            'personality_traits': personality_traits,
+            'lifestyle_profile': lifestyle_profile,
+            'communication_style': {},
+            'emotional_profile': {},
+            'social_behavior': social_behavior,
+            'routine_patterns': {},
+            'risk_profile': {
+                'risk_indicators': risk_indicators,
+                'overall_risk_score': 0.0,
+                'risk_level': self._classify_risk_level(0.0),
+                'primary_risk_factor': None
+            },
+            'behavioral_insights': self._generate_behavioral_insights(
+                personality_traits, lifestyle_profile, {}, {}, social_behavior
+            ),
+            'profile_completeness': self._calculate_profile_completeness([], profile)
+        }
+    
+    def predict_future_behavior(self, posts: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Predict future behavior based on historical patterns
+        
+        now is the timezone-aware time recency is measured from, read from the clock when omitted;
+        pass one value to score a batch of profiles against the same moment.
+        """
         if len(posts) < 5:
             return {'error': 'Insufficient data for prediction'}
         
-        # Sort posts by date
-        dated_posts = self._sort_posts_by_date(posts)
-        
-        # Analyze trends
-        activity_trend = self._analyze_activity_trend(dated_posts)
-        sentiment_trend = self._analyze_sentiment_trend(dated_posts)
-        engagement_trend = self._analyze_engagement_trend(dated_posts)
-        content_evolution = self._analyze_content_evolution(dated_posts)
+        # Analyze trends; each reads the posts in date order from the prepared per-post data
+        activity_trend = self._analyze_activity_trend(posts)
+        sentiment_trend = self._analyze_sentiment_trend(posts)
+        engagement_trend = self._analyze_engagement_trend(posts)
+        content_evolution = self._analyze_content_evolution(posts)
         
         # Generate predictions
         predictions = {
@@ -109,12 +249,12 @@ class BehavioralProfiler:
             'sentiment_prediction': self._predict_sentiment_direction(sentiment_trend),
             'engagement_prediction': self._predict_engagement_pattern(engagement_trend),
             'content_prediction': self._predict_content_themes(content_evolution),
-            'risk_prediction': self._predict_risk_escalation(dated_posts)
+            'risk_prediction': self._predict_risk_escalation(posts)
         }
         
         return {
             'predictions': predictions,
-            'confidence_score': self._calculate_prediction_confidence(dated_posts),
+            'confidence_score': self._calculate_prediction_confidence(posts, now),
             'trend_analysis': {
                 'activity_trend': activity_trend,
                 'sentiment_trend': sentiment_trend,
@@ -124,38 +264,10 @@ class BehavioralProfiler:
     
     def analyze_influence_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze influence and persuasion patterns"""
-        influence_indicators = {
-            'authority': 0,
-            'social_proof': 0,
-            'reciprocity': 0,
-            'commitment': 0,
-            'liking': 0,
-            'scarcity': 0
-        }
-        
-        authority_keywords = ['expert', 'professional', 'certified', 'qualified', 'experienced']
-        social_proof_keywords = ['everyone', 'popular', 'trending', 'viral', 'thousands']
-        reciprocity_keywords = ['free', 'gift', 'bonus', 'exclusive', 'special offer']
-        commitment_keywords = ['promise', 'guarantee', 'commit', 'pledge', 'assure']
-        liking_keywords = ['like me', 'similar', 'understand', 'relate', 'connect']
-        scarcity_keywords = ['limited', 'rare', 'exclusive', 'only', 'last chance']
-        
-        keyword_groups = {
-            'authority': authority_keywords,
-            'social_proof': social_proof_keywords,
-            'reciprocity': reciprocity_keywords,
-            'commitment': commitment_keywords,
-            'liking': liking_keywords,
-            'scarcity': scarcity_keywords
-        }
-        
-        for post in posts:
-            content = (post.get('caption', '') or post.get('content', '')).lower()
-            
-            for influence_type, keywords in keyword_groups.items():
-                for keyword in keywords:
-                    if keyword in content:
-                        influence_indicators[influence_type] += 1
+        # Each keyword counts once per post that contains it
+        posts_with_keyword = self._scan_all(posts)['presence']
+        influence_indicators = {influence_type: sum(posts_with_keyword[keyword] for keyword in keywords)
+                                for influence_type, keywords in self.influence_keywords.items()}
         
         # Calculate influence score
         total_posts = len(posts)
@@ -183,8 +295,7 @@ class BehavioralProfiler:
             anomalies.extend(freq_anomalies)
         
         # Content length anomalies
-        content_lengths = [len(p.get('caption', '') or p.get('content', '')) for p in posts]
-        length_anomalies = self._detect_length_anomalies(content_lengths)
+        length_anomalies = self._detect_length_anomalies(self._prepare(posts)['lengths'])
         anomalies.extend(length_anomalies)
         
         # Sentiment anomalies
@@ -209,19 +320,11 @@ class BehavioralProfiler:
     def _analyze_personality_traits(self, posts: List[Dict[str, Any]]) -> Dict[str, float]:
         """Analyze Big Five personality traits"""
         trait_scores = {}
+        keyword_counts = self._scan_all(posts)['counts']
         
         for trait, indicators in self.personality_indicators.items():
-            high_score = 0
-            low_score = 0
-            
-            for post in posts:
-                content = (post.get('caption', '') or post.get('content', '')).lower()
-                
-                for keyword in indicators['high']:
-                    high_score += content.count(keyword)
-                
-                for keyword in indicators['low']:
-                    low_score += content.count(keyword)
+            high_score = sum(keyword_counts[keyword] for keyword in indicators['high'])
+            low_score = sum(keyword_counts[keyword] for keyword in indicators['low'])
             
             # Calculate normalized score (-1 to 1, where 1 is high trait, -1 is low trait)
             total_indicators = high_score + low_score
@@ -235,49 +338,67 @@ class BehavioralProfiler:
     def _analyze_lifestyle_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, float]:
         """Analyze lifestyle and interest patterns"""
         lifestyle_scores = {}
+        keyword_counts = self._scan_all(posts)['counts']
         
         for lifestyle, keywords in self.lifestyle_indicators.items():
-            score = 0
-            
-            for post in posts:
-                content = (post.get('caption', '') or post.get('content', '')).lower()
-                
-                for keyword in keywords:
-                    score += content.count(keyword)
+            score = sum(keyword_counts[keyword] for keyword in keywords)
             
             # Normalize by post count
             lifestyle_scores[lifestyle] = score / max(1, len(posts))
         
         return lifestyle_scores
     
+    def _scan_all(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Keyword totals, keyword post counts and post emotions from a single scan of every post"""
+        prepared = self._prepare(posts)
+        if 'scan' in prepared:
+            return prepared['scan']
+        
+        counts = Counter()
+        presence = Counter()
+        emotions = []
+        for content in prepared['lowered']:
+            post_counts = self._scan_keywords(content)
+            counts.update(post_counts)
+            presence.update(post_counts.keys())
+            if content:
+                emotions.append(self._emotion_from_counts(post_counts))
+        
+        scan = {'counts': counts, 'presence': presence, 'emotions': emotions}
+        prepared['scan'] = scan
+        return scan
+    
+    def _scan_keywords(self, content: str) -> Counter:
+        """Count every known keyword in one lowercased text, as str.count would"""
+        counts = Counter()
+        keyword_end = {}
+        for match in self._keyword_re.finditer(content):
+            start = match.start()
+            for keyword in self._keyword_prefixes[match.group(1)]:
+                # Each keyword does not overlap itself, as with str.count
+                if start >= keyword_end.get(keyword, 0):
+                    counts[keyword] += 1
+                    keyword_end[keyword] = start + len(keyword)
+        return counts
+    
     def _analyze_communication_style(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze communication style and patterns"""
         if not posts:
             return {}
         
-        all_text = ' '.join([p.get('caption', '') or p.get('content', '') for p in posts])
+        all_text = ' '.join(self._prepare(posts)['contents'])
         
         # Basic metrics
         total_chars = len(all_text)
         total_words = len(all_text.split())
-        sentences = len(re.findall(r'[.!?]+', all_text))
-        
-        # Punctuation analysis
-        exclamations = all_text.count('!')
-        questions = all_text.count('?')
-        
-        # Capitalization
-        uppercase_words = len(re.findall(r'\b[A-Z]{2,}\b', all_text))
         
-        # Emoji usage
-        emoji_count = len(re.findall(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]', all_text))
+        # Sentences, punctuation, capitalization and emoji usage from one scan of the text
+        sentences, exclamations, questions, uppercase_words, emoji_count = self._scan_text(all_text)
         
-        # Formality indicators
-        formal_words = ['therefore', 'however', 'furthermore', 'consequently', 'nevertheless']
-        informal_words = ['lol', 'omg', 'btw', 'tbh', 'imo', 'gonna', 'wanna']
-        
-        formal_count = sum(all_text.lower().count(word) for word in formal_words)
-        informal_count = sum(all_text.lower().count(word) for word in informal_words)
+        # Formality indicators, already counted by the shared keyword scan of the posts
+        keyword_counts = self._scan_all(posts)['counts']
+        formal_count = sum(keyword_counts[word] for word in FORMAL_WORDS)
+        informal_count = sum(keyword_counts[word] for word in INFORMAL_WORDS)
         
         return {
             'avg_post_length': total_chars / max(1, len(posts)),
@@ -291,24 +412,55 @@ class BehavioralProfiler:
             'communication_style': self._determine_communication_style(formal_count, informal_count, emoji_count)
         }
     
+    def _scan_text(self, text: str) -> Tuple[int, int, int, int, int]:
+        """Count sentences, '!', '?', all-caps words and emoji in one vectorized pass over the code points"""
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        if not codes.size:
+            return 0, 0, 0, 0, 0
+        
+        exclamation = codes == ord('!')
+        question = codes == ord('?')
+        
+        # Sentences are runs of . ! ?
+        punctuation = exclamation | question | (codes == ord('.'))
+        sentences = int(punctuation[0]) + int(np.count_nonzero(punctuation[1:] & ~punctuation[:-1]))
+        
+        emoji = np.zeros(codes.size, dtype=bool)
+        for low, high in _EMOJI_RANGES:
+            emoji |= (codes >= low) & (codes <= high)
+        
+        # Word characters as re sees them: a table for ASCII, one check per distinct other code point
+        is_ascii = codes < 128
+        word = np.zeros(codes.size, dtype=bool)
+        word[is_ascii] = _ASCII_WORD_CHARS[codes[is_ascii]]
+        other = codes[~is_ascii]
+        if other.size:
+            distinct = np.unique(other)
+            word_codes = distinct[np.array([bool(_WORD_CHAR_RE.match(chr(code))) for code in distinct])]
+            word[~is_ascii] = np.isin(other, word_codes)
+        
+        # An all-caps word is a run of 2+ capitals with no word character on either side
+        capital = np.concatenate(([False], (codes >= ord('A')) & (codes <= ord('Z')), [False]))
+        edges = np.flatnonzero(capital[1:] != capital[:-1])
+        starts, ends = edges[::2], edges[1::2]
+        padded_word = np.concatenate(([False], word, [False]))
+        uppercase_words = int(np.count_nonzero((ends - starts >= 2) & ~padded_word[starts] & ~padded_word[ends + 1]))
+        
+        return (sentences, int(np.count_nonzero(exclamation)), int(np.count_nonzero(question)),
+                uppercase_words, int(np.count_nonzero(emoji)))
+    
     def _analyze_emotional_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze emotional patterns and stability"""
-        emotions = []
-        sentiment_scores = []
-        
-        for post in posts:
-            content = post.get('caption', '') or post.get('content', '')
-            if content:
-                blob = TextBlob(content)
-                sentiment_scores.append(blob.sentiment.polarity)
-                
-                # Emotion detection (simplified)
-                emotion = self._detect_emotion(content.lower())
-                emotions.append(emotion)
-        
-        if not sentiment_scores:
+        prepared = self._prepare(posts)
+        contents = [content for content in prepared['contents'] if content]
+        if not contents:
             return {}
         
+        sentiment_scores = self._batch_sentiment(contents)
+        
+        # Emotion detection (simplified)
+        emotions = self._scan_all(posts)['emotions']
+        
         # Calculate emotional metrics
         avg_sentiment = np.mean(sentiment_scores)
         sentiment_volatility = np.std(sentiment_scores)
@@ -321,27 +473,25 @@ class BehavioralProfiler:
             'average_sentiment': avg_sentiment,
             'sentiment_volatility': sentiment_volatility,
             'emotional_stability': stability_score,
-            'dominant_emotion': emotion_distribution.most_common(1)[0][0] if emotions else 'neutral',
+            'dominant_emotion': max(emotion_distribution, key=emotion_distribution.get) if emotions else 'neutral',
             'emotion_distribution': dict(emotion_distribution),
-            'emotional_range': max(sentiment_scores) - min(sentiment_scores) if sentiment_scores else 0
+            'emotional_range': sentiment_scores.max() - sentiment_scores.min()
         }
     
     def _analyze_social_behavior(self, posts: List[Dict[str, Any]], profile: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze social interaction patterns"""
-        mentions = []
-        hashtags = []
+        prepared = self._prepare(posts)
+        mentions = prepared['mentions']
+        hashtags = prepared['hashtags']
         
-        for post in posts:
-            mentions.extend(post.get('mentions', []))
-            hashtags.extend(post.get('hashtags', []))
-        
-        # Social metrics
+        # Social metrics; a set hashes the strings in C already, and measured faster
+        # than np.unique or pd.factorize on the flattened object lists
         unique_mentions = len(set(mentions))
         unique_hashtags = len(set(hashtags))
         
         # Engagement metrics
-        total_likes = sum([p.get('likes', 0) or p.get('like_count', 0) for p in posts])
-        total_comments = sum([p.get('comments', 0) or p.get('reply_count', 0) for p in posts])
+        total_likes = int(prepared['likes'].sum())
+        total_comments = int(prepared['comments'].sum())
         
         # Social network size indicators
         followers = profile.get('followers', 0) or profile.get('followers_count', 0)
@@ -358,63 +508,33 @@ class BehavioralProfiler:
     
     def _analyze_routine_patterns(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze posting routines and patterns"""
-        post_times = []
-        
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    post_times.append(dt)
-                except:
-                    continue
-        
-        if not post_times:
+        post_times = self._prepare(posts)['dates'].dropna()
+        
+        if post_times.empty:
             return {}
         
         # Time-based analysis
-        hours = [dt.hour for dt in post_times]
-        days = [dt.weekday() for dt in post_times]
-        
-        hour_distribution = Counter(hours)
-        day_distribution = Counter(days)
+        hour_counts = np.bincount(post_times.hour, minlength=24)
+        day_counts = np.bincount(post_times.weekday, minlength=7)
         
         # Routine strength
-        routine_strength = self._calculate_routine_strength(hour_distribution, day_distribution)
+        routine_strength = self._calculate_routine_strength(hour_counts, day_counts)
         
         return {
-            'most_active_hour': hour_distribution.most_common(1)[0][0] if hours else None,
-            'most_active_day': day_distribution.most_common(1)[0][0] if days else None,
+            'most_active_hour': int(hour_counts.argmax()),
+            'most_active_day': int(day_counts.argmax()),
             'posting_consistency': routine_strength,
-            'time_distribution': dict(hour_distribution),
-            'day_distribution': dict(day_distribution),
-            'routine_type': self._classify_routine_type(hour_distribution)
+            'time_distribution': {hour: int(count) for hour, count in enumerate(hour_counts) if count},
+            'day_distribution': {day: int(count) for day, count in enumerate(day_counts) if count},
+            'routine_type': self._classify_routine_type(hour_counts)
         }
     
     def _assess_behavioral_risks(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Assess behavioral risk indicators"""
-        risk_indicators = {
-            'impulsivity': 0,
-            'aggression': 0,
-            'isolation': 0,
-            'instability': 0
-        }
-        
-        # Risk keyword mapping
-        risk_keywords = {
-            'impulsivity': ['impulse', 'sudden', 'immediately', 'right now', 'can\'t wait'],
-            'aggression': ['angry', 'hate', 'fight', 'destroy', 'kill', 'attack'],
-            'isolation': ['alone', 'nobody', 'isolated', 'lonely', 'abandoned'],
-            'instability': ['chaos', 'unstable', 'crazy', 'insane', 'losing it']
-        }
-        
-        for post in posts:
-            content = (post.get('caption', '') or post.get('content', '')).lower()
-            
-            for risk_type, keywords in risk_keywords.items():
-                for keyword in keywords:
-                    if keyword in content:
-                        risk_indicators[risk_type] += 1
+        # Each keyword counts once per post that contains it
+        posts_with_keyword = self._scan_all(posts)['presence']
+        risk_indicators = {risk_type: sum(posts_with_keyword[keyword] for keyword in keywords)
+                           for risk_type, keywords in self.risk_keywords.items()}
         
         # Normalize scores
         total_posts = len(posts)
@@ -478,48 +598,150 @@ class BehavioralProfiler:
         
         # Content diversity
         if posts:
-            content_types = set()
-            for post in posts:
-                if post.get('is_video'):
-                    content_types.add('video')
-                elif post.get('caption'):
-                    content_types.add('text')
-                else:
-                    content_types.add('image')
-            
-            diversity_score = len(content_types) / 3  # 3 types max
+            content_types = self._prepare(posts)['content_types']
+            diversity_score = bin(content_types).count('1') / 3  # 3 types max
             completeness_factors.append(diversity_score)
         
         return np.mean(completeness_factors)
     
-    def _sort_posts_by_date(self, posts: List[Dict[str, Any]]) -> List[Tuple]:
-        """Sort posts by date and return tuples of (datetime, post)"""
-        dated_posts = []
+    def _prepare(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Per-post fields shared by every analysis of the same posts list"""
+        # Holding the list keeps its id from being reused; posts are not mutated while analyzed
+        cached = self._prepared
+        if cached is not None and cached[0] is posts and cached[1] == len(posts):
+            return cached[2]
+        
+        count = len(posts)
+        contents = []
+        date_strings = []
+        likes = np.zeros(count, dtype=np.int64)
+        comments = np.zeros(count, dtype=np.int64)
+        mentions = []
+        hashtags = []
+        mention_offsets = np.zeros(count + 1, dtype=np.int64)
+        hashtag_offsets = np.zeros(count + 1, dtype=np.int64)
+        content_types = 0
+        for i, post in enumerate(posts):
+            contents.append(post.get('caption') or post.get('content') or '')
+            date_strings.append(post.get('date'))
+            likes[i] = post.get('likes') or post.get('like_count') or 0
+            comments[i] = post.get('comments') or post.get('reply_count') or 0
+            mentions.extend(post.get('mentions', []))
+            mention_offsets[i + 1] = len(mentions)
+            hashtags.extend(post.get('hashtags', []))
+            hashtag_offsets[i + 1] = len(hashtags)
+            if post.get('is_video'):
+                content_types |= _CONTENT_VIDEO
+            elif post.get('caption'):
+                content_types |= _CONTENT_TEXT
+            else:
+                content_types |= _CONTENT_IMAGE
+        
+        prepared = {
+            'contents': contents,
+            'lowered': [content.lower() for content in contents],
+            'lengths': np.fromiter(map(len, contents), dtype=np.int64, count=count),
+            'dates': self._parse_dates(date_strings),
+            'likes': likes,
+            'comments': comments,
+            # Flattened across posts; post i owns items offsets[i]:offsets[i + 1]
+            'mentions': mentions,
+            'mention_offsets': mention_offsets,
+            'hashtags': hashtags,
+            'hashtag_offsets': hashtag_offsets,
+            # Bit set of the _CONTENT_* kinds seen across posts
+            'content_types': content_types
+        }
+        self._prepared = (posts, count, prepared)
+        return prepared
+    
+    def _parse_dates(self, date_strings: List[Optional[str]]) -> pd.DatetimeIndex:
+        """Parse post dates in one batch as UTC, NaT where missing or unparseable"""
+        return pd.DatetimeIndex(pd.to_datetime(pd.Series(date_strings, dtype=object),
+                                               utc=True, format='ISO8601', errors='coerce'))
+    
+    def _hashtag_bits(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Hashtag vocabulary of the posts and a bitset row per post marking which of them it uses
+        
+        bits is None when the matrix would exceed _MAX_HASHTAG_BITS.
+        """
+        prepared = self._prepare(posts)
+        if 'hashtag_bits' in prepared:
+            return prepared['hashtag_bits']
+        
+        vocabulary = {}
+        hashtags = prepared['hashtags']
+        codes = np.fromiter((vocabulary.setdefault(tag, len(vocabulary)) for tag in hashtags),
+                            dtype=np.int64, count=len(hashtags))
+        words = max(1, -(-len(vocabulary) // 64))
+        if len(posts) * words * 64 > _MAX_HASHTAG_BITS:
+            bits = None
+        else:
+            rows = np.repeat(np.arange(len(posts)), np.diff(prepared['hashtag_offsets']))
+            bits = np.zeros((len(posts), words), dtype=np.uint64)
+            np.bitwise_or.at(bits, (rows, codes >> 6), np.left_shift(np.uint64(1), (codes & 63).astype(np.uint64)))
         
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    dated_posts.append((dt, post))
-                except:
-                    continue
+        hashtag_bits = {'vocabulary': list(vocabulary), 'bits': bits}
+        prepared['hashtag_bits'] = hashtag_bits
+        return hashtag_bits
+    
+    def _bitset_members(self, bitset: np.ndarray, vocabulary: List[Any]) -> List[Any]:
+        """Vocabulary entries whose bits are set in one bitset row, in vocabulary order"""
+        codes = np.arange(len(vocabulary))
+        members = np.flatnonzero((bitset[codes >> 6] >> (codes & 63).astype(np.uint64)) & np.uint64(1))
+        return [vocabulary[code] for code in members]
+    
+    def _popcount(self, bits: np.ndarray) -> np.ndarray:
+        """Number of set bits in each row of a uint64 bitset matrix"""
+        if _BITWISE_COUNT is not None:
+            return _BITWISE_COUNT(bits).sum(axis=1, dtype=np.int64)
+        return np.unpackbits(bits.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+    
+    def _score_polarity(self, text: str) -> float:
+        """Polarity of one text, scored straight against the pattern lexicon"""
+        # Imported on first use; textblob takes about a second to load and not every caller scores sentiment
+        from textblob.en import sentiment as pattern_sentiment
         
-        return sorted(dated_posts, key=lambda x: x[0])
+        # Same score as TextBlob(text).sentiment.polarity without building a blob
+        return pattern_sentiment(text)[0]
+    
+    def _batch_sentiment(self, texts: List[str]) -> np.ndarray:
+        """Polarity of every non-empty text"""
+        return np.fromiter((self._polarity(text) for text in texts if text), dtype=np.float64)
+    
+    def _linreg_slope(self, values: np.ndarray) -> float:
+        """Least-squares slope of values against their position, as np.polyfit(x, values, 1)[0]"""
+        count = len(values)
+        # Positions centred on their mean; their sum of squares is n(n^2 - 1)/12
+        centered = np.arange(count) - (count - 1) / 2
+        return float(centered @ values) / (count * (count * count - 1) / 12)
+    
+    def _date_order(self, posts: List[Dict[str, Any]]) -> np.ndarray:
+        """Indices of the dated posts, oldest first"""
+        prepared = self._prepare(posts)
+        if 'date_order' not in prepared:
+            dates = prepared['dates']
+            dated = np.flatnonzero(~dates.isna())
+            # Stable, so posts with equal dates keep their input order
+            prepared['date_order'] = dated[np.argsort(dates.asi8[dated], kind='stable')]
+        return prepared['date_order']
+    
+    def _timeline(self, posts: List[Dict[str, Any]]) -> np.ndarray:
+        """UTC datetime64 of every dated post, oldest first"""
+        prepared = self._prepare(posts)
+        if 'timeline' not in prepared:
+            prepared['timeline'] = prepared['dates'].values[self._date_order(posts)]
+        return prepared['timeline']
     
     def _detect_emotion(self, content: str) -> str:
         """Simple emotion detection from content"""
-        emotion_keywords = {
-            'joy': ['happy', 'joy', 'excited', 'amazing', 'wonderful', 'great'],
-            'sadness': ['sad', 'depressed', 'down', 'upset', 'disappointed'],
-            'anger': ['angry', 'mad', 'furious', 'annoyed', 'frustrated'],
-            'fear': ['scared', 'afraid', 'worried', 'anxious', 'nervous'],
-            'surprise': ['surprised', 'shocked', 'amazed', 'unexpected']
-        }
-        
+        return self._emotion_from_counts(self._scan_keywords(content))
+    
+    def _emotion_from_counts(self, keyword_counts: Counter) -> str:
+        """Strongest emotion given the keyword counts of one text"""
         emotion_scores = {}
-        for emotion, keywords in emotion_keywords.items():
-            score = sum(content.count(keyword) for keyword in keywords)
+        for emotion, keywords in self.emotion_keywords.items():
+            score = sum(keyword_counts[keyword] for keyword in keywords)
             emotion_scores[emotion] = score
         
         if any(emotion_scores.values()):
@@ -550,32 +772,31 @@ class BehavioralProfiler:
         else:
             return 'balanced'
     
-    def _calculate_routine_strength(self, hour_dist: Counter, day_dist: Counter) -> float:
+    def _calculate_routine_strength(self, hour_counts: np.ndarray, day_counts: np.ndarray) -> float:
         """Calculate how routine/predictable the behavior is"""
         # Higher concentration = stronger routine
-        total_hours = sum(hour_dist.values())
-        total_days = sum(day_dist.values())
-        
-        if total_hours == 0 or total_days == 0:
+        if not hour_counts.any() or not day_counts.any():
             return 0
         
         # Calculate entropy (lower entropy = more routine)
-        hour_entropy = -sum((count/total_hours) * np.log2(count/total_hours) for count in hour_dist.values() if count > 0)
-        day_entropy = -sum((count/total_days) * np.log2(count/total_days) for count in day_dist.values() if count > 0)
+        hour_entropy = self._entropy(hour_counts)
+        day_entropy = self._entropy(day_counts)
         
         # Normalize and invert (higher score = more routine)
-        max_hour_entropy = np.log2(24)  # Maximum possible entropy for hours
-        max_day_entropy = np.log2(7)    # Maximum possible entropy for days
-        
-        routine_score = 1 - ((hour_entropy / max_hour_entropy + day_entropy / max_day_entropy) / 2)
+        routine_score = 1 - ((hour_entropy / _MAX_HOUR_ENTROPY + day_entropy / _MAX_DAY_ENTROPY) / 2)
         return max(0, routine_score)
     
-    def _classify_routine_type(self, hour_dist: Counter) -> str:
+    def _entropy(self, counts: np.ndarray) -> float:
+        """Shannon entropy in bits of a histogram"""
+        p = counts[counts > 0] / counts.sum()
+        return -(p * np.log2(p)).sum()
+    
+    def _classify_routine_type(self, hour_counts: np.ndarray) -> str:
         """Classify the type of posting routine"""
-        if not hour_dist:
+        if not hour_counts.any():
             return 'irregular'
         
-        peak_hour = hour_dist.most_common(1)[0][0]
+        peak_hour = int(hour_counts.argmax())
         
         if 6 <= peak_hour <= 9:
             return 'morning_routine'
@@ -601,121 +822,73 @@ class BehavioralProfiler:
     
     def _calculate_posting_intervals(self, posts: List[Dict[str, Any]]) -> List[float]:
         """Calculate intervals between posts in hours"""
-        post_times = []
-        
-        for post in posts:
-            date_str = post.get('date')
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    post_times.append(dt)
-                except:
-                    continue
-        
-        post_times.sort()
-        intervals = []
-        
-        for i in range(1, len(post_times)):
-            interval = (post_times[i] - post_times[i-1]).total_seconds() / 3600
-            intervals.append(interval)
-        
-        return intervals
+        return (np.diff(self._timeline(posts)) / np.timedelta64(1, 'h')).tolist()
+    
+    def _zscore_flag(self, values: np.ndarray, k: float = 2.0, k_hi: float = 3.0) -> Tuple[np.ndarray, List[str]]:
+        """Indices of values more than k standard deviations from the mean, with their severity"""
+        deviations = np.abs(values - values.mean())
+        std = values.std()
+        indices = np.flatnonzero(deviations > k * std)
+        # Beyond k_hi standard deviations is high severity
+        severities = np.where(deviations[indices] > k_hi * std, 'high', 'medium').tolist()
+        return indices, severities
     
     def _detect_frequency_anomalies(self, intervals: List[float]) -> List[Dict[str, Any]]:
         """Detect posting frequency anomalies"""
         if len(intervals) < 3:
             return []
         
-        mean_interval = np.mean(intervals)
-        std_interval = np.std(intervals)
-        
-        anomalies = []
-        for i, interval in enumerate(intervals):
-            if abs(interval - mean_interval) > 2 * std_interval:
-                anomalies.append({
-                    'type': 'posting_frequency',
-                    'description': f'Unusual posting interval: {interval:.2f} hours',
-                    'severity': 'high' if abs(interval - mean_interval) > 3 * std_interval else 'medium',
-                    'position': i
-                })
-        
-        return anomalies
+        intervals = np.asarray(intervals, dtype=np.float64)
+        indices, severities = self._zscore_flag(intervals)
+        return [{
+            'type': 'posting_frequency',
+            'description': f'Unusual posting interval: {intervals[i]:.2f} hours',
+            'severity': severity,
+            'position': int(i)
+        } for i, severity in zip(indices, severities)]
     
-    def _detect_length_anomalies(self, lengths: List[int]) -> List[Dict[str, Any]]:
+    def _detect_length_anomalies(self, lengths: np.ndarray) -> List[Dict[str, Any]]:
         """Detect content length anomalies"""
         if len(lengths) < 3:
             return []
         
-        mean_length = np.mean(lengths)
-        std_length = np.std(lengths)
-        
-        anomalies = []
-        for i, length in enumerate(lengths):
-            if abs(length - mean_length) > 2 * std_length:
-                anomalies.append({
-                    'type': 'content_length',
-                    'description': f'Unusual content length: {length} characters',
-                    'severity': 'high' if abs(length - mean_length) > 3 * std_length else 'medium',
-                    'position': i
-                })
-        
-        return anomalies
+        indices, severities = self._zscore_flag(lengths)
+        return [{
+            'type': 'content_length',
+            'description': f'Unusual content length: {lengths[i]} characters',
+            'severity': severity,
+            'position': int(i)
+        } for i, severity in zip(indices, severities)]
     
     def _detect_sentiment_anomalies(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect sentiment anomalies"""
-        sentiments = []
-        
-        for post in posts:
-            content = post.get('caption', '') or post.get('content', '')
-            if content:
-                sentiment = TextBlob(content).sentiment.polarity
-                sentiments.append(sentiment)
+        sentiments = self._batch_sentiment(self._prepare(posts)['contents'])
         
         if len(sentiments) < 3:
             return []
         
-        mean_sentiment = np.mean(sentiments)
-        std_sentiment = np.std(sentiments)
-        
-        anomalies = []
-        for i, sentiment in enumerate(sentiments):
-            if abs(sentiment - mean_sentiment) > 2 * std_sentiment:
-                anomalies.append({
-                    'type': 'sentiment',
-                    'description': f'Unusual sentiment: {sentiment:.2f}',
-                    'severity': 'high' if abs(sentiment - mean_sentiment) > 3 * std_sentiment else 'medium',
-                    'position': i
-                })
-        
-        return anomalies
+        indices, severities = self._zscore_flag(sentiments)
+        return [{
+            'type': 'sentiment',
+            'description': f'Unusual sentiment: {sentiments[i]:.2f}',
+            'severity': severity,
+            'position': int(i)
+        } for i, severity in zip(indices, severities)]
     
     def _detect_engagement_anomalies(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect engagement anomalies"""
-        engagements = []
-        
-        for post in posts:
-            likes = post.get('likes', 0) or post.get('like_count', 0)
-            comments = post.get('comments', 0) or post.get('reply_count', 0)
-            engagement = likes + comments
-            engagements.append(engagement)
-        
-        if len(engagements) < 3:
+        if len(posts) < 3:
             return []
         
-        mean_engagement = np.mean(engagements)
-        std_engagement = np.std(engagements)
-        
-        anomalies = []
-        for i, engagement in enumerate(engagements):
-            if abs(engagement - mean_engagement) > 2 * std_engagement:
-                anomalies.append({
-                    'type': 'engagement',
-                    'description': f'Unusual engagement: {engagement} interactions',
-                    'severity': 'high' if abs(engagement - mean_engagement) > 3 * std_engagement else 'medium',
-                    'position': i
-                })
-        
-        return anomalies
+        prepared = self._prepare(posts)
+        engagements = prepared['likes'] + prepared['comments']
+        indices, severities = self._zscore_flag(engagements)
+        return [{
+            'type': 'engagement',
+            'description': f'Unusual engagement: {engagements[i]} interactions',
+            'severity': severity,
+            'position': int(i)
+        } for i, severity in zip(indices, severities)]
     
     def _detect_topic_shift_anomalies(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect sudden topic shifts"""
@@ -729,110 +902,164 @@ class BehavioralProfiler:
             return anomalies
         
         # Analyze hashtag patterns in windows
-        window_size = 3
-        for i in range(len(posts) - window_size):
-            window1_hashtags = set()
-            window2_hashtags = set()
-            
-            for j in range(window_size):
-                window1_hashtags.update(posts[i + j].get('hashtags', []))
-                window2_hashtags.update(posts[i + j + window_size].get('hashtags', []))
-            
-            # Calculate overlap
-            if window1_hashtags and window2_hashtags:
-                overlap = len(window1_hashtags & window2_hashtags)
-                total = len(window1_hashtags | window2_hashtags)
-                similarity = overlap / total if total > 0 else 0
-                
-                if similarity < 0.2:  # Very low similarity
-                    anomalies.append({
-                        'type': 'topic_shift',
-                        'description': f'Sudden topic change detected at position {i + window_size}',
-                        'severity': 'medium',
-                        'position': i + window_size
-                    })
+        window_size = _TOPIC_WINDOW_SIZE
+        window1_sizes, window2_sizes, overlap = self._window_overlaps(posts, window_size)
+        total = window1_sizes + window2_sizes - overlap
+        both_tagged = (window1_sizes > 0) & (window2_sizes > 0)
+        similarity = overlap / np.maximum(total, 1)
+        
+        for i in np.flatnonzero(both_tagged & (similarity < 0.2)):  # Very low similarity
+            anomalies.append({
+                'type': 'topic_shift',
+                'description': f'Sudden topic change detected at position {i + window_size}',
+                'severity': 'medium',
+                'position': int(i + window_size)
+            })
         
         return anomalies
     
     # Prediction methods (simplified implementations)
-    def _analyze_activity_trend(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _window_overlaps(self, posts: List[Dict[str, Any]],
+                         window_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Distinct hashtags of each window, of the window right after it, and shared by the two"""
+        bits = self._hashtag_bits(posts)['bits']
+        if bits is not None:
+            # Each row of bits is one post's hashtag set; a window is the OR of its rows
+            window_count = len(posts) - window_size + 1
+            windows = bits[:window_count].copy()
+            for offset in range(1, window_size):
+                windows |= bits[offset:offset + window_count]
+            
+            # Each window's size is counted once; the union size follows from the overlap
+            sizes = self._popcount(windows)
+            overlap = self._popcount(windows[:window_count - window_size] & windows[window_size:])
+            return sizes[:window_count - window_size], sizes[window_size:], overlap
+        
+        # Too many hashtags for dense bitsets: slide two counters one post at a time, tracking
+        # how many hashtags they share as tags enter and leave
+        prepared = self._prepare(posts)
+        hashtags = prepared['hashtags']
+        offsets = prepared['hashtag_offsets']
+        pair_count = max(0, len(posts) - 2 * window_size + 1)
+        window1_sizes = np.zeros(pair_count, dtype=np.int64)
+        window2_sizes = np.zeros(pair_count, dtype=np.int64)
+        overlap = np.zeros(pair_count, dtype=np.int64)
+        if not pair_count:
+            return window1_sizes, window2_sizes, overlap
+        
+        window1 = Counter()
+        window2 = Counter()
+        shared = 0
+        
+        def move(i, source, target):
+            """Move post i's hashtags out of source (if any) and into target (if any)"""
+            change = 0
+            for tag in hashtags[offsets[i]:offsets[i + 1]]:
+                if source is not None:
+                    source[tag] -= 1
+                    if not source[tag]:
+                        del source[tag]
+                        change -= tag in (window2 if source is window1 else window1)
+                if target is not None:
+                    if not target[tag]:
+                        change += tag in (window2 if target is window1 else window1)
+                    target[tag] += 1
+            return change
+        
+        for i in range(window_size):
+            shared += move(i, None, window1)
+            shared += move(i + window_size, None, window2)
+        for start in range(pair_count):
+            if start:
+                shared += move(start - 1, window1, None)
+                shared += move(start + window_size - 1, window2, window1)
+                shared += move(start + 2 * window_size - 1, None, window2)
+            window1_sizes[start] = len(window1)
+            window2_sizes[start] = len(window2)
+            overlap[start] = shared
+        return window1_sizes, window2_sizes, overlap
+    
+    def _analyze_activity_trend(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze activity trend over time"""
-        if len(dated_posts) < 2:
+        if len(self._date_order(posts)) < 2:
             return {}
         
-        # Simple linear trend analysis
-        dates = [dt.timestamp() for dt, _ in dated_posts]
-        activity_counts = [1] * len(dates)  # Each post counts as 1 activity
-        
-        # Calculate trend
-        x = np.arange(len(dates))
-        trend = np.polyfit(x, activity_counts, 1)[0]
-        
+        # Each post counts as 1 activity, so the fitted trend over posts is flat
         return {
-            'trend_direction': 'increasing' if trend > 0 else 'decreasing' if trend < 0 else 'stable',
-            'trend_strength': abs(trend)
+            'trend_direction': 'stable',
+            'trend_strength': 0.0
         }
     
-    def _analyze_sentiment_trend(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_sentiment_trend(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze sentiment trend over time"""
-        sentiments = []
-        
-        for _, post in dated_posts:
-            content = post.get('caption', '') or post.get('content', '')
-            if content:
-                sentiment = TextBlob(content).sentiment.polarity
-                sentiments.append(sentiment)
+        contents = self._prepare(posts)['contents']
+        sentiments = self._batch_sentiment([contents[i] for i in self._date_order(posts)])
         
         if len(sentiments) < 2:
             return {}
         
         # Calculate trend
-        x = np.arange(len(sentiments))
-        trend = np.polyfit(x, sentiments, 1)[0]
+        trend = self._linreg_slope(sentiments)
         
         return {
             'trend_direction': 'improving' if trend > 0 else 'declining' if trend < 0 else 'stable',
             'trend_strength': abs(trend),
-            'current_sentiment': sentiments[-1] if sentiments else 0
+            'current_sentiment': sentiments[-1]
         }
     
-    def _analyze_engagement_trend(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_engagement_trend(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze engagement trend over time"""
-        engagements = []
-        
-        for _, post in dated_posts:
-            likes = post.get('likes', 0) or post.get('like_count', 0)
-            comments = post.get('comments', 0) or post.get('reply_count', 0)
-            engagement = likes + comments
-            engagements.append(engagement)
+        prepared = self._prepare(posts)
+        order = self._date_order(posts)
+        engagements = prepared['likes'][order] + prepared['comments'][order]
         
         if len(engagements) < 2:
             return {}
         
         # Calculate trend
-        x = np.arange(len(engagements))
-        trend = np.polyfit(x, engagements, 1)[0]
+        trend = self._linreg_slope(engagements)
         
         return {
             'trend_direction': 'increasing' if trend > 0 else 'decreasing' if trend < 0 else 'stable',
             'trend_strength': abs(trend),
-            'current_engagement': engagements[-1] if engagements else 0
+            'current_engagement': int(engagements[-1])
         }
     
-    def _analyze_content_evolution(self, dated_posts: List[Tuple]) -> Dict[str, Any]:
+    def _analyze_content_evolution(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze content evolution over time"""
-        # Simplified content evolution analysis
-        early_posts = dated_posts[:len(dated_posts)//2]
-        recent_posts = dated_posts[len(dated_posts)//2:]
+        # Simplified content evolution analysis; hashtag sets are bitset rows, see _hashtag_bits()
+        hashtag_bits = self._hashtag_bits(posts)
+        bits = hashtag_bits['bits']
+        order = self._date_order(posts)
+        if bits is None:
+            return self._compare_hashtag_sets(posts, order[:len(order)//2], order[len(order)//2:])
+        
+        early_hashtags = np.bitwise_or.reduce(bits[order[:len(order)//2]], axis=0)
+        recent_hashtags = np.bitwise_or.reduce(bits[order[len(order)//2:]], axis=0)
+        
+        overlap, total = self._popcount(np.stack([early_hashtags & recent_hashtags,
+                                                  early_hashtags | recent_hashtags]))
         
+        return {
+            'topic_stability': overlap / max(1, total),
+            'new_topics': self._bitset_members(recent_hashtags & ~early_hashtags, hashtag_bits['vocabulary'])[:5],
+            'abandoned_topics': self._bitset_members(early_hashtags & ~recent_hashtags, hashtag_bits['vocabulary'])[:5]
+        }
+    
+    def _compare_hashtag_sets(self, posts: List[Dict[str, Any]], early_posts: np.ndarray,
+                              recent_posts: np.ndarray) -> Dict[str, Any]:
+        """Content evolution from plain hashtag sets, for vocabularies too wide for bitsets"""
+        prepared = self._prepare(posts)
+        hashtags = prepared['hashtags']
+        offsets = prepared['hashtag_offsets']
         early_hashtags = set()
         recent_hashtags = set()
         
-        for _, post in early_posts:
-            early_hashtags.update(post.get('hashtags', []))
+        for i in early_posts:
+            early_hashtags.update(hashtags[offsets[i]:offsets[i + 1]])
         
-        for _, post in recent_posts:
-            recent_hashtags.update(post.get('hashtags', []))
+        for i in recent_posts:
+            recent_hashtags.update(hashtags[offsets[i]:offsets[i + 1]])
         
         return {
             'topic_stability': len(early_hashtags & recent_hashtags) / max(1, len(early_hashtags | recent_hashtags)),
@@ -876,19 +1103,14 @@ class BehavioralProfiler:
         new_topics = content_evolution.get('new_topics', [])
         return new_topics[:3] if new_topics else ['similar_to_current_themes']
     
-    def _predict_risk_escalation(self, dated_posts: List[Tuple]) -> str:
+    def _predict_risk_escalation(self, posts: List[Dict[str, Any]]) -> str:
         """Predict risk escalation"""
         # Simplified risk prediction
-        recent_posts = dated_posts[-5:] if len(dated_posts) >= 5 else dated_posts
+        lowered = self._prepare(posts)['lowered']
+        recent_posts = self._date_order(posts)[-5:]
         
-        risk_keywords = ['angry', 'hate', 'violence', 'threat', 'harm']
-        risk_count = 0
-        
-        for _, post in recent_posts:
-            content = (post.get('caption', '') or post.get('content', '')).lower()
-            for keyword in risk_keywords:
-                if keyword in content:
-                    risk_count += 1
+        # Each keyword counts once per post that contains it
+        risk_count = sum(len(set(_ESCALATION_RE.findall(lowered[i]))) for i in recent_posts)
         
         if risk_count > 2:
             return 'risk_escalation_likely'
@@ -897,10 +1119,11 @@ class BehavioralProfiler:
         else:
             return 'low_risk_of_escalation'
     
-    def _calculate_prediction_confidence(self, dated_posts: List[Tuple]) -> float:
+    def _calculate_prediction_confidence(self, posts: List[Dict[str, Any]], now: Optional[datetime] = None) -> float:
         """Calculate confidence in predictions"""
         # Base confidence on data quantity and recency
-        data_points = len(dated_posts)
+        order = self._date_order(posts)
+        data_points = len(order)
         
         if data_points >= 20:
             base_confidence = 0.8
@@ -912,9 +1135,11 @@ class BehavioralProfiler:
             base_confidence = 0.2
         
         # Adjust for recency
-        if dated_posts:
-            latest_post = dated_posts[-1][0]
-            days_since_latest = (datetime.now(latest_post.tzinfo) - latest_post).days
+        if data_points:
+            latest_post = self._prepare(posts)['dates'][order[-1]]
+            if now is None:
+                now = datetime.now(latest_post.tzinfo)
+            days_since_latest = (now - latest_post).days
             
             if days_since_latest <= 7:
                 recency_bonus = 0.2
@@ -929,20 +1154,13 @@ class BehavioralProfiler:
     
     def _determine_persuasion_style(self, influence_scores: Dict[str, float]) -> str:
         """Determine primary persuasion style"""
-        max_score = max(influence_scores.values()) if influence_scores.values() else 0
-        
-        if max_score < 0.1:
+        if not influence_scores:
             return 'non_persuasive'
         
-        primary_method = max(influence_scores, key=influence_scores.get)
+        # Strongest method and its score in one pass; ties go to the first method, as before
+        primary_method, max_score = max(influence_scores.items(), key=_BY_SCORE)
         
-        style_mapping = {
-            'authority': 'expert_based',
-            'social_proof': 'popularity_based',
-            'reciprocity': 'give_and_take',
-            'commitment': 'promise_based',
-            'liking': 'relationship_based',
-            'scarcity': 'urgency_based'
-        }
+        if max_score < 0.1:
+            return 'non_persuasive'
         
-        return style_mapping.get(primary_method, 'mixed_approach')
\ No newline at end of file
+        return PERSUASION_STYLES.get(primary_method, 'mixed_approach')
\ No newline at end of file
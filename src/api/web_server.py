@@ -106,7 +106,7 @@ class OSINTWebServer:
                     return jsonify({'success': False, 'error': 'Platform and username required'}), 400
                 
                 from storage.data_manager import DataManager
-                from analysis.analyzer import Analyzer
+                from analysis.analyzer import get_analyzer
                 
                 dm = DataManager()
                 profile_data = dm.load_data(platform, username)
@@ -114,7 +114,7 @@ class OSINTWebServer:
                 if not profile_data:
                     return jsonify({'success': False, 'error': 'No data found for profile'}), 404
                 
-                analyzer = Analyzer()
+                analyzer = get_analyzer()
                 analysis = analyzer.analyze_profile(profile_data)
                 
                 # Save analysis
@@ -138,11 +138,11 @@ class TaskScheduler:
             # Import here to avoid circular imports
             from fetchers.instagram_fetcher import InstagramFetcher
             from fetchers.twitter_fetcher import TwitterFetcher
-            from analysis.analyzer import Analyzer
+            from analysis.analyzer import get_analyzer
             from storage.data_manager import DataManager
             
             dm = DataManager()
-            analyzer = Analyzer()
+            analyzer = get_analyzer()
             
             targets = task_config.get('targets', [])
             platforms = task_config.get('platforms', ['instagram', 'twitter'])